@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class AlumniConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Alumni'
+
+    def ready(self):
+        from api.versions import track
+        from search.index import register
+
+        from .models import Alumni
+
+        track(Alumni)
+        register(Alumni, 'alumni', title='name')
@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-17 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Alumni', '0003_remove_alumni_description_remove_alumni_insta_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumni',
+            name='image_meta',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='alumni',
+            name='image',
+            field=models.ImageField(default='default.webp', upload_to='images/Alumni'),
+        ),
+    ]
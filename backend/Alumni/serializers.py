@@ -1,7 +1,10 @@
 from rest_framework import serializers
+from api.serializers import SparseFieldsMixin
 from .models import Alumni
+from imaging.serializers import ProcessedImageFieldsMixin
+
+class AlumniSerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
 
-class AlumniSerializer(serializers.ModelSerializer):
     class Meta:
         model = Alumni
-        fields = ['id', 'name', 'email', 'message', 'linkedin_url', 'instagram_url', 'image']
\ No newline at end of file
+        fields = ['id', 'name', 'email', 'message', 'linkedin_url', 'instagram_url', 'image', 'image_srcset', 'image_width', 'image_height', 'image_placeholder']
\ No newline at end of file
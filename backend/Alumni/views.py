@@ -3,6 +3,9 @@ from .models import Alumni
 
 # For API
 from rest_framework import generics
+from api.fastpath import FastListMixin
+from api.mixins import ConditionalListMixin, SparseQuerysetMixin
+from api.pagination import OptInCursorPagination
 from .serializers import AlumniSerializer
 
 # Existing page view
@@ -11,6 +14,8 @@ def alumni(request):
     return render(request, 'alumni.html',{'alumni_list': alumni_list}) # Use consistent naming
 
 # API View
-class AlumniListAPIView(generics.ListAPIView):
-    queryset = Alumni.objects.all()
-    serializer_class = AlumniSerializer
\ No newline at end of file
+class AlumniListAPIView(ConditionalListMixin, SparseQuerysetMixin, FastListMixin, generics.ListAPIView):
+    queryset = Alumni.objects.order_by('pk')
+    serializer_class = AlumniSerializer
+    pagination_class = OptInCursorPagination
+    cursor_ordering = 'pk'
\ No newline at end of file
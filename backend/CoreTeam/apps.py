@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreteamConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'CoreTeam'
+
+    def ready(self):
+        from api.versions import track
+        from search.index import register
+
+        from .models import MemberDetail
+
+        track(MemberDetail)
+        register(MemberDetail, 'member', title='name')
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-17 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoreTeam', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='memberdetail',
+            name='image_meta',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-17 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoreTeam', '0002_memberdetail_image_meta'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='memberdetail',
+            index=models.Index(fields=['position'], name='coreteam_position_idx'),
+        ),
+    ]
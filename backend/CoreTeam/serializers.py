@@ -1,9 +1,13 @@
 from rest_framework import serializers
+from api.serializers import SparseFieldsMixin
 from .models import MemberDetail
+from imaging.serializers import ProcessedImageFieldsMixin
+
+class MemberDetailSerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
+    field_columns = {'position_display': ('position',)}
 
-class MemberDetailSerializer(serializers.ModelSerializer):
     position_display = serializers.CharField(source='get_position_display', read_only=True)
 
     class Meta:
         model = MemberDetail
-        fields = ['id', 'name', 'email', 'message', 'position', 'position_display', 'linkedin_url', 'instagram_url', 'image']
\ No newline at end of file
+        fields = ['id', 'name', 'email', 'message', 'position', 'position_display', 'linkedin_url', 'instagram_url', 'image', 'image_srcset', 'image_width', 'image_height', 'image_placeholder']
\ No newline at end of file
@@ -3,28 +3,48 @@ from .models import MemberDetail
 
 # For API
 from rest_framework import generics
+from rest_framework.response import Response
+from api.mixins import ConditionalListMixin, SparseQuerysetMixin
+from api.timing import TimedListMixin, timed
 from .serializers import MemberDetailSerializer
 
 # Existing page view
 def CoreTeam(request): # Function name typically starts with lowercase (e.g., core_team_view)
-    team_members = MemberDetail.objects.all()
-    # Group members by position for the template
-    # Using a dictionary comprehension for conciseness
-    # And ensuring all position keys exist even if empty
-    grouped_members = {
-        pos_key: team_members.filter(position=pos_key)
-        for pos_key, _ in MemberDetail.POSITIONS
-    }
-    # Original grouping (works fine too):
-    # members = {
-    #     'A': team_members.filter(position='A'), # Coordinators
-    #     'B': team_members.filter(position='B'), # Co-coordinators
-    #     'C': team_members.filter(position='C'), # Core Team
-    #     'D': team_members.filter(position='D'), # Mentors
-    # }
+    # Group members by position for the template: one query, grouped in memory,
+    # with every position key present even if empty
+    grouped_members = MemberDetail.objects.grouped_by_position()
     return render(request, 'CoreTeam.html', {'grouped_members': grouped_members}) # Use more descriptive context variable name
 
 # API View
-class MemberDetailListAPIView(generics.ListAPIView):
+class MemberDetailListAPIView(ConditionalListMixin, SparseQuerysetMixin, TimedListMixin, generics.ListAPIView):
+    """
+    The core team. With ?grouped=1, grouped as on the CoreTeam page, in
+    MemberDetail.POSITIONS order:
+
+        [{"position": "A", "position_display": "Coordinator", "members": [...]}, ...]
+    """
     queryset = MemberDetail.objects.all()
-    serializer_class = MemberDetailSerializer
\ No newline at end of file
+    serializer_class = MemberDetailSerializer
+
+    def is_grouped(self):
+        return self.request.query_params.get('grouped') in ('1', 'true')
+
+    def get_required_columns(self):
+        columns = super().get_required_columns()
+        return [*columns, 'position'] if self.is_grouped() else columns
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_grouped():
+            return super().list(request, *args, **kwargs)
+        labels = dict(MemberDetail.POSITIONS)
+        groups = self.filter_queryset(self.get_queryset()).grouped_by_position()
+        with timed('serialize'):
+            data = [
+                {
+                    'position': position,
+                    'position_display': labels.get(position, position),
+                    'members': self.get_serializer(members, many=True).data,
+                }
+                for position, members in groups.items()
+            ]
+        return Response(data)
\ No newline at end of file
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class EventsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Events'
+
+    def ready(self):
+        from api.versions import track
+        from search.index import register
+
+        from .models import Astrax, Pleiades, Utkarsh, Zenith
+
+        track(Astrax, Pleiades, Zenith, Utkarsh)
+        for model in (Astrax, Pleiades, Zenith, Utkarsh):
+            register(model, model._meta.model_name, title='name', body=['description'])
@@ -1,32 +1,34 @@
 from rest_framework import serializers
+from api.serializers import SparseFieldsMixin
 from .models import Astrax, Pleiades, Zenith, Utkarsh
+from imaging.serializers import ProcessedImageFieldsMixin
 
-class AstraxSerializer(serializers.ModelSerializer):
+class AstraxSerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
     # image = serializers.ImageField(use_url=True) # use_url=True is default for ImageField with context
     
     class Meta:
         model = Astrax
-        fields = ['id', 'name', 'image', 'description']
+        fields = ['id', 'name', 'image', 'image_srcset', 'image_width', 'image_height', 'image_placeholder', 'description']
         # To get full URLs for images, the serializer needs the request context.
         # Generic views (like ListAPIView) provide this context automatically.
 
-class PleiadesSerializer(serializers.ModelSerializer):
+class PleiadesSerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
     # image = serializers.ImageField(use_url=True)
 
     class Meta:
         model = Pleiades
-        fields = ['id', 'name', 'image', 'description', 'problem_statement']
+        fields = ['id', 'name', 'image', 'image_srcset', 'image_width', 'image_height', 'image_placeholder', 'description', 'problem_statement']
 
-class ZenithSerializer(serializers.ModelSerializer):
+class ZenithSerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
     # image = serializers.ImageField(use_url=True)
 
     class Meta:
         model = Zenith
-        fields = ['id', 'name', 'image', 'description', 'problem_statement']
+        fields = ['id', 'name', 'image', 'image_srcset', 'image_width', 'image_height', 'image_placeholder', 'description', 'problem_statement']
 
-class UtkarshSerializer(serializers.ModelSerializer):
+class UtkarshSerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
     # image = serializers.ImageField(use_url=True)
 
     class Meta:
         model = Utkarsh
-        fields = ['id', 'name', 'image', 'description', 'problem_statement']
\ No newline at end of file
+        fields = ['id', 'name', 'image', 'image_srcset', 'image_width', 'image_height', 'image_placeholder', 'description', 'problem_statement']
\ No newline at end of file
@@ -21,6 +21,7 @@ def pleiades_page_view(request):
 
 # --- New API Views ---
 from rest_framework import generics
+from api.mixins import ConditionalListMixin, SparseQuerysetMixin
 from .models import Astrax, Pleiades, Zenith, Utkarsh
 from .serializers import (
     AstraxSerializer,
@@ -29,18 +30,18 @@ from .serializers import (
     UtkarshSerializer
 )
 
-class AstraxListAPIView(generics.ListAPIView):
+class AstraxListAPIView(ConditionalListMixin, SparseQuerysetMixin, generics.ListAPIView):
     queryset = Astrax.objects.all()
     serializer_class = AstraxSerializer
 
-class PleiadesListAPIView(generics.ListAPIView):
+class PleiadesListAPIView(ConditionalListMixin, SparseQuerysetMixin, generics.ListAPIView):
     queryset = Pleiades.objects.all()
     serializer_class = PleiadesSerializer
 
-class ZenithListAPIView(generics.ListAPIView):
+class ZenithListAPIView(ConditionalListMixin, SparseQuerysetMixin, generics.ListAPIView):
     queryset = Zenith.objects.all()
     serializer_class = ZenithSerializer
 
-class UtkarshListAPIView(generics.ListAPIView):
+class UtkarshListAPIView(ConditionalListMixin, SparseQuerysetMixin, generics.ListAPIView):
     queryset = Utkarsh.objects.all()
     serializer_class = UtkarshSerializer
\ No newline at end of file
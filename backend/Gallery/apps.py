@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class GalleryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Gallery'
+
+    def ready(self):
+        from api.versions import track
+        from search.index import register
+
+        from .models import PhotoGallery, VideoGallery
+
+        track(PhotoGallery, VideoGallery)
+        register(PhotoGallery, 'photo', title='name', body=['description'])
+        register(VideoGallery, 'video', title='videoname', body=['description'])
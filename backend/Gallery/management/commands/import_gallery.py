@@ -0,0 +1,156 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.versions import bump
+from Gallery.models import PhotoGallery
+from imaging.models import StoredImage
+from imaging.processing import process_image
+from imaging.worker import init_pool_process
+from search.index import index_objects
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.tif', '.tiff', '.bmp', '.gif'}
+NAME_MAX_LENGTH = PhotoGallery._meta.get_field('name').max_length
+
+
+def _written_bytes(meta):
+    """Bytes of every derivative process_image() wrote: display, srcset widths and their other formats."""
+    entries = [meta, *meta.get('srcset', ())]
+    return sum(
+        entry['bytes'] + sum(variant['bytes'] for variant in entry.get('variants', {}).values())
+        for entry in entries
+    )
+
+
+def _remove_stored(cas_name):
+    """
+    Delete the original stored as ``cas_name`` and any derivatives written
+    for it before a failure, unless a record already uses them.
+    """
+    if StoredImage.objects.filter(name=cas_name).exists():
+        return
+    directory, filename = os.path.split(cas_name)
+    stem = os.path.splitext(filename)[0] + '.' # Derivatives are '<stem>.<label>.<ext>' (derivative_name)
+    _, files = default_storage.listdir(directory)
+    for file in files:
+        if file.startswith(stem) and not file.endswith('.tmp'): # .tmp: another upload of these bytes in progress
+            default_storage.delete(f"{directory}/{file}")
+
+
+def _import_file(path):
+    """
+    Runs in a pool process: store the file and build its derivatives.
+    Returns (path, cas_name, meta, source_bytes, written_bytes) or
+    (path, None, error, 0, 0).
+    """
+    cas_name = None
+    try:
+        with open(path, 'rb') as f:
+            cas_name = default_storage.save('images/photogallery/' + os.path.basename(path), File(f))
+
+        blob = StoredImage.objects.filter(name=cas_name).first()
+        if blob is not None and blob.meta and default_storage.exists(blob.meta['display']):
+            meta, written = blob.meta, 0 # Same bytes already imported; nothing new encoded
+        else:
+            display_name, meta = process_image(default_storage, cas_name)
+            meta['display'] = display_name
+            written = _written_bytes(meta)
+        return path, cas_name, meta, os.path.getsize(path), written
+    except Exception as e:
+        if cas_name:
+            _remove_stored(cas_name)
+        return path, None, str(e), 0, 0
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a directory of photos into the photo gallery. Images are resized and "
+        "WebP-encoded across a process pool and inserted in batches. Photos whose name "
+        "(the file name without extension) is already in the gallery are skipped, so an "
+        "interrupted import can simply be run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processes to encode with (default: CPU count).")
+        parser.add_argument('--batch-size', type=int, default=100, help="Rows per bulk insert (default: 100).")
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        if not os.path.isdir(directory):
+            raise CommandError(f"{directory} is not a directory")
+
+        existing = set(PhotoGallery.objects.values_list('name', flat=True))
+        pending = {}
+        skipped = 0
+        for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+            stem, ext = os.path.splitext(entry.name)
+            name = stem[:NAME_MAX_LENGTH]
+            if not entry.is_file() or ext.lower() not in IMAGE_EXTENSIONS:
+                continue
+            if name in existing:
+                skipped += 1
+            elif name in pending:
+                self.stderr.write(f"Skipping {entry.name}: another file is already imported as '{name}'")
+            else:
+                pending[name] = entry.path
+
+        self.stdout.write(f"Importing {len(pending)} photo(s), {skipped} already in the gallery.")
+        if not pending:
+            return
+
+        names = {path: name for name, path in pending.items()}
+        imported = failed = source_bytes = display_bytes = output_bytes = 0
+        batch = []
+        started = time.monotonic()
+        with ProcessPoolExecutor(max_workers=options['workers'], initializer=init_pool_process) as pool:
+            for path, cas_name, result, size, written in pool.map(_import_file, pending.values(), chunksize=4):
+                if cas_name is None:
+                    failed += 1
+                    self.stderr.write(f"Failed to import {path}: {result}")
+                    continue
+                batch.append((names[path], cas_name, result))
+                source_bytes += size
+                display_bytes += result['bytes']
+                output_bytes += written
+                if len(batch) >= options['batch_size']:
+                    imported += self._insert(batch)
+                    batch = []
+                    self.stdout.write(f"  {imported}/{len(pending)} imported")
+            imported += self._insert(batch)
+
+        elapsed = time.monotonic() - started
+        saved = source_bytes - display_bytes
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} photo(s) in {elapsed:.1f}s "
+            f"({imported / elapsed if elapsed else 0:.1f} images/sec), {failed} failed. "
+            f"Originals {source_bytes / 1e6:.1f} MB, display WebPs {display_bytes / 1e6:.1f} MB: "
+            f"{saved / 1e6:.1f} MB saved ({saved / source_bytes if source_bytes else 0:.0%}). "
+            f"{output_bytes / 1e6:.1f} MB of derivatives written (display and srcset WebPs and their other formats)."
+        ))
+
+    @transaction.atomic
+    def _insert(self, batch):
+        if not batch:
+            return 0
+        photos = [
+            PhotoGallery(name=name, image=meta['display'], image_meta=meta)
+            for name, _, meta in batch
+        ]
+        PhotoGallery.objects.bulk_create(photos)
+
+        # bulk_create skips save() and signals, so take the storage references,
+        # record the change for API ETags and index the photos for search by hand
+        bump(PhotoGallery)
+        index_objects(photos)
+        for cas_name, count in Counter(cas_name for _, cas_name, _ in batch).items():
+            StoredImage.objects.acquire(cas_name, count)
+        for _, cas_name, meta in batch:
+            StoredImage.objects.filter(name=cas_name).update(meta=meta)
+        return len(photos)
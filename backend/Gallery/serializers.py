@@ -1,12 +1,15 @@
 from rest_framework import serializers
+from api.serializers import SparseFieldsMixin
 from .models import PhotoGallery, VideoGallery
+from imaging.serializers import ProcessedImageFieldsMixin
+
+class PhotoGallerySerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
 
-class PhotoGallerySerializer(serializers.ModelSerializer):
     class Meta:
         model = PhotoGallery
-        fields = ['id', 'name', 'image', 'description']
+        fields = ['id', 'name', 'image', 'image_srcset', 'image_width', 'image_height', 'image_placeholder', 'description']
 
-class VideoGallerySerializer(serializers.ModelSerializer):
+class VideoGallerySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = VideoGallery
         fields = ['id', 'videoname', 'link', 'description']
\ No newline at end of file
@@ -1,3 +1,82 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from api.versions import get_versions
+from imaging.models import StoredImage
+from imaging.storage import CAS_DIR
+from imaging.tests import TempMediaMixin, image_bytes
+
+from .models import PhotoGallery
+
+
+class InlineExecutor:
+    """Stands in for the command's process pool, which can't see the test database."""
+    def __init__(self, max_workers=None, initializer=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def map(self, fn, iterable, chunksize=1):
+        return map(fn, iterable)
+
+
+@mock.patch('Gallery.management.commands.import_gallery.ProcessPoolExecutor', InlineExecutor)
+class ImportGalleryTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        same = image_bytes((400, 300), 'navy')
+        self.broken = b'not an image'
+        for name, content in (('a.png', same), ('b.png', same), ('c.png', image_bytes((400, 300), 'red')),
+                              ('broken.png', self.broken), ('old.png', image_bytes()), ('notes.txt', b'x')):
+            with open(os.path.join(self.directory, name), 'wb') as f:
+                f.write(content)
+        PhotoGallery.objects.create(name='old') # Imported by an earlier, interrupted run
+
+    def run_import(self):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_gallery', self.directory, batch_size=2, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import(self):
+        version = get_versions([PhotoGallery])[0][0]
+        out, err = self.run_import()
+
+        self.assertIn("Importing 4 photo(s), 1 already in the gallery.", out)
+        self.assertIn("Imported 3 photo(s)", out)
+        self.assertIn("1 failed", out)
+        self.assertIn("MB saved (", out)
+        self.assertIn("Failed to import", err)
+        self.assertEqual(sorted(PhotoGallery.objects.values_list('name', flat=True)), ['a', 'b', 'c', 'old'])
+        self.assertGreater(get_versions([PhotoGallery])[0][0], version)
+
+        a, b, c = (PhotoGallery.objects.get(name=name) for name in 'abc')
+        self.assertEqual(a.image.name, b.image.name) # Same bytes, stored and encoded once
+        self.assertTrue(default_storage.exists(a.image.name))
+        self.assertEqual(StoredImage.objects.get(name=a.image_meta['original']).refcount, 2)
+        self.assertEqual(StoredImage.objects.get(name=c.image_meta['original']).refcount, 1)
+
+        # The broken file was stored before it failed to decode; nothing of it is left
+        sha = hashlib.sha256(self.broken).hexdigest()
+        self.assertFalse(default_storage.exists(f"{CAS_DIR}/{sha[:2]}/{sha}.png"))
+
+    def test_rerun_skips_imported(self):
+        self.run_import()
+        out, _ = self.run_import()
+        self.assertIn("Importing 1 photo(s), 4 already in the gallery.", out) # Only the broken file is retried
+        self.assertEqual(PhotoGallery.objects.count(), 4)
+        a = PhotoGallery.objects.get(name='a')
+        self.assertEqual(StoredImage.objects.get(name=a.image_meta['original']).refcount, 2)
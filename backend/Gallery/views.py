@@ -3,6 +3,9 @@ from .models import PhotoGallery, VideoGallery
 
 # For API
 from rest_framework import generics
+from api.fastpath import FastListMixin
+from api.mixins import ConditionalListMixin, SparseQuerysetMixin
+from api.pagination import OptInCursorPagination
 from .serializers import PhotoGallerySerializer, VideoGallerySerializer
 
 # Existing page views
@@ -15,10 +18,12 @@ def videogallery(request):
     return render(request, "videogallery.html", {"videos": videos})
 
 # API Views
-class PhotoGalleryListAPIView(generics.ListAPIView):
-    queryset = PhotoGallery.objects.all()
+class PhotoGalleryListAPIView(ConditionalListMixin, SparseQuerysetMixin, FastListMixin, generics.ListAPIView):
+    queryset = PhotoGallery.objects.order_by('pk')
     serializer_class = PhotoGallerySerializer
+    pagination_class = OptInCursorPagination
+    cursor_ordering = 'pk'
 
-class VideoGalleryListAPIView(generics.ListAPIView):
+class VideoGalleryListAPIView(ConditionalListMixin, SparseQuerysetMixin, generics.ListAPIView):
     queryset = VideoGallery.objects.all()
     serializer_class = VideoGallerySerializer
\ No newline at end of file
@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class HomepageConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'HomePage'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from api.versions import track
+        from imaging.signals import image_processed
+
+        from .cache import invalidate_on_commit
+        from .models import Achievements, ClubActivity, Fests, Projects
+
+        for model in (Projects, ClubActivity, Achievements, Fests):
+            uid = f'homepage_cache_{model.__name__}'
+            post_save.connect(invalidate_on_commit, sender=model, dispatch_uid=uid)
+            post_delete.connect(invalidate_on_commit, sender=model, dispatch_uid=uid)
+            image_processed.connect(invalidate_on_commit, sender=model, dispatch_uid=uid)
+        # After the cache receivers, so the cache is invalidated before
+        # snapshots (api.snapshots) re-render the endpoint
+        track(Projects, ClubActivity, Achievements, Fests)
@@ -0,0 +1,42 @@
+# HomePage/cache.py
+"""
+Response cache for /api/homepage/ (HomePage.views.HomePageAPIView).
+
+The payload holds absolute image URLs, so entries are per scheme and host
+(and per ``?fields=``/``?omit=`` combination).
+Keys also include a generation token. Any change to the homepage models
+replaces the token (after the transaction commits), which orphans every
+cached copy at once. The old entries then expire on their own. A request
+reads the token before it queries, so a response built from pre-change
+rows is never stored under the new token.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+from api.serializers import sparse_fieldset
+
+GENERATION_KEY = 'homepage:generation'
+
+
+def _new_generation():
+    return uuid.uuid4().hex
+
+
+def cache_key(request):
+    generation = cache.get_or_set(GENERATION_KEY, _new_generation, None)
+    key = f"homepage:{generation}:{request.scheme}://{request.get_host()}"
+    only, omit = sparse_fieldset(request)
+    if only is not None or omit:
+        key += f":{','.join(sorted(only or ['*']))}:{','.join(sorted(omit))}"
+    return key
+
+
+def invalidate():
+    cache.set(GENERATION_KEY, _new_generation(), None)
+
+
+def invalidate_on_commit(**kwargs):
+    """Signal receiver for post_save/post_delete/image_processed on the homepage models."""
+    transaction.on_commit(invalidate)
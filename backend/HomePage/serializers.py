@@ -1,13 +1,17 @@
 # HomePage/serializers.py
 from rest_framework import serializers
+from api.serializers import SparseFieldsMixin
 from .models import Projects, ClubActivity, Achievements, Fests # Assuming these are your models in HomePage/models.py
+from imaging.serializers import ProcessedImageFieldsMixin
+
+class ProjectsSerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
+    field_columns = {'image_url': ('image',)}
 
-class ProjectsSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Projects
-        fields = ['id', 'topic', 'description', 'image_url'] # Add other fields as needed
+        fields = ['id', 'topic', 'description', 'image_url', 'image_srcset', 'image_width', 'image_height', 'image_placeholder'] # Add other fields as needed
 
     def get_image_url(self, obj):
         request = self.context.get('request')
@@ -15,12 +19,14 @@ class ProjectsSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.image.url)
         return None
 
-class ClubActivitySerializer(serializers.ModelSerializer):
+class ClubActivitySerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
+    field_columns = {'image_url': ('image',)}
+
     image_url = serializers.SerializerMethodField()
 
     class Meta:
         model = ClubActivity
-        fields = ['id', 'activity', 'content', 'image_url'] # Add other fields as needed
+        fields = ['id', 'activity', 'content', 'image_url', 'image_srcset', 'image_width', 'image_height', 'image_placeholder'] # Add other fields as needed
 
     def get_image_url(self, obj):
         request = self.context.get('request')
@@ -28,17 +34,19 @@ class ClubActivitySerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.image.url)
         return None
 
-class AchievementsSerializer(serializers.ModelSerializer):
+class AchievementsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Achievements
         fields = ['id', 'achievement', 'link'] # Adjust if you have an image field
 
-class FestsSerializer(serializers.ModelSerializer):
+class FestsSerializer(SparseFieldsMixin, ProcessedImageFieldsMixin, serializers.ModelSerializer):
+    field_columns = {'image_url': ('image',)}
+
     image_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Fests
-        fields = ['id', 'festname', 'description', 'link', 'image_url'] # Add other fields as needed
+        fields = ['id', 'festname', 'description', 'link', 'image_url', 'image_srcset', 'image_width', 'image_height', 'image_placeholder'] # Add other fields as needed
 
     def get_image_url(self, obj):
         request = self.context.get('request')
@@ -1,3 +1,56 @@
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from imaging.signals import image_processed
+
+from .models import Achievements, ClubActivity, Fests, Projects
+
+# (model, name field, section in the response)
+SECTIONS = [
+    (Projects, 'topic', 'projects'),
+    (ClubActivity, 'activity', 'clubactivity'),
+    (Achievements, 'achievement', 'achievements'),
+    (Fests, 'festname', 'fests'),
+]
+
+
+class HomePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def fetch(self, cached):
+        """The homepage; from the cache (only the ETag's versions queried) or built (and the four lists)."""
+        with self.assertNumQueries(1 if cached else 5):
+            response = self.client.get('/api/homepage/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def names(self, data, section, field):
+        return [item[field] for item in data[section]]
+
+    def test_reused_until_a_change_commits(self):
+        for model, field, section in SECTIONS:
+            for change in ('save', 'delete', 'image_processed'):
+                with self.subTest(model=model.__name__, change=change):
+                    obj = model.objects.create(**{field: f'{section} {change}'})
+                    cache.clear()
+                    self.assertIn(f'{section} {change}', self.names(self.fetch(cached=False), section, field))
+                    self.fetch(cached=True)
+
+                    with self.captureOnCommitCallbacks(execute=True):
+                        if change == 'save':
+                            setattr(obj, field, f'{section} renamed')
+                            obj.save()
+                        elif change == 'delete':
+                            obj.delete()
+                        else:
+                            image_processed.send(sender=model, pk=obj.pk)
+                        self.fetch(cached=True) # Not before the commit
+
+                    names = self.names(self.fetch(cached=False), section, field)
+                    self.fetch(cached=True)
+                    if change == 'save':
+                        self.assertEqual(names, [f'{section} renamed'])
+                    elif change == 'delete':
+                        self.assertEqual(names, [])
+                    model.objects.all().delete()
@@ -1,7 +1,17 @@
 # HomePage/views.py
+import functools
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from api.concurrency import AggregateMixin
+from api.mixins import ConditionalListMixin
+from api.serializers import sparse_queryset
+from api.timing import timed
+from .cache import cache_key
 from .models import Projects, ClubActivity, Achievements, Fests
 from .serializers import (
     ProjectsSerializer,
@@ -9,11 +19,14 @@ from .serializers import (
     AchievementsSerializer,
     FestsSerializer
 )
-# Optional: for better logging in production
-# import logging
-# logger = logging.getLogger(__name__)
 
-class HomePageData(APIView):
+logger = logging.getLogger(__name__)
+
+class HomePageAPIView(AggregateMixin, APIView):
+    """
+    Everything the homepage shows, in one response. Served from the cache
+    (see HomePage.cache) until one of the four models changes.
+    """
     def get_serializer_context(self):
         """
         Extra context provided to the serializer class.
@@ -25,36 +38,43 @@ class HomePageData(APIView):
             'view': self
         }
 
+    def serialize_section(self, model, serializer_class):
+        # Get serializer context which includes the request
+        context = self.get_serializer_context()
+        # ?fields= / ?omit= also trim the SELECT (see api.serializers)
+        queryset = sparse_queryset(model.objects.all(), serializer_class(context=context))
+        with timed('serialize'):
+            return serializer_class(queryset, many=True, context=context).data
+
     def get(self, request, *args, **kwargs):
+        key = cache_key(request)
+        response_data = cache.get(key)
+        if response_data is not None:
+            return Response(response_data, status=status.HTTP_200_OK)
+
         try:
-            projects_data = Projects.objects.all()
-            club_activity_data = ClubActivity.objects.all()
-            achievements_data = Achievements.objects.all()
-            fests_data = Fests.objects.all()
-
-            # Get serializer context which includes the request
-            context = self.get_serializer_context()
-
-            # Pass context to serializers
-            projects_serializer = ProjectsSerializer(projects_data, many=True, context=context)
-            club_activity_serializer = ClubActivitySerializer(club_activity_data, many=True, context=context)
-            # Context might not be strictly needed for AchievementsSerializer if it doesn't use request,
-            # but it's good practice for consistency if you might add it later.
-            achievements_serializer = AchievementsSerializer(achievements_data, many=True, context=context)
-            fests_serializer = FestsSerializer(fests_data, many=True, context=context)
-
-            response_data = {
-                "projects": projects_serializer.data,
-                "clubactivity": club_activity_serializer.data,
-                "achievements": achievements_serializer.data,
-                "fests": fests_serializer.data,
-            }
+            # The four lists are independent, so they can be fetched concurrently (see api.concurrency)
+            response_data = self.run_parts({
+                "projects": functools.partial(self.serialize_section, Projects, ProjectsSerializer),
+                "clubactivity": functools.partial(self.serialize_section, ClubActivity, ClubActivitySerializer),
+                "achievements": functools.partial(self.serialize_section, Achievements, AchievementsSerializer),
+                "fests": functools.partial(self.serialize_section, Fests, FestsSerializer),
+            })
+            cache.set(key, response_data, settings.HOMEPAGE_CACHE_TIMEOUT)
             return Response(response_data, status=status.HTTP_200_OK)
 
         except Exception as e:
-            # logger.error(f"Error fetching homepage data: {e}", exc_info=True) # Production logging
-            print(f"Error in HomePageData view: {str(e)}") # For development debugging
+            logger.exception("Error fetching homepage data")
             return Response(
                 {"error": "An error occurred while fetching homepage data.", "details": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class HomePageData(ConditionalListMixin, HomePageAPIView):
+    """
+    The homepage endpoint, answering conditional GETs until one of the four
+    models changes. The ETag also lets api.compression keep the compressed
+    body, so cache hits aren't compressed again.
+    """
+    version_models = (Projects, ClubActivity, Achievements, Fests) # Also read by api.snapshots
@@ -59,12 +59,17 @@ INSTALLED_APPS = [
     'ckeditor',
     'Alumni',
     'HomePage',
+    'imaging', # Background image processing shared by the apps above
+    'api', # Shared API plumbing: change tracking, conditional GETs, SQLite tuning
+    'search', # Full-text search over the apps above (SQLite FTS5)
 
     'django_browser_reload',
 ]
 
 MIDDLEWARE = [
+    'api.timing.RequestTimingMiddleware', # Server-Timing and slow request log; first, so its total covers the rest
     'django.middleware.security.SecurityMiddleware',
+    'api.compression.CompressionMiddleware', # Brotli/gzip; must run after anything that edits response bodies
     'django.contrib.sessions.middleware.SessionMiddleware', # <<< Must be before AuthMiddleware
     'corsheaders.middleware.CorsMiddleware',                # <<< Correct position
     'django.middleware.common.CommonMiddleware',
@@ -120,12 +125,29 @@ NPM_BIN_PATH = env('NPM_BIN_PATH', default="C:/Program Files/nodejs/npm.cmd") #
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+# DATABASE_PROFILE=production tunes SQLite for concurrent readers (WAL and the
+# pragmas below, see api.sqlite) and keeps connections open between requests
+DATABASE_PROFILE = env('DATABASE_PROFILE', default='development')
+_PRODUCTION_DB = DATABASE_PROFILE == 'production'
+# Connection options and pragmas of the production profile (see api.sqlite)
+SQLITE_PRODUCTION_OPTIONS = {'timeout': 20, 'transaction_mode': 'IMMEDIATE'} # timeout: seconds a writer waits for the lock
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': env.int('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024),
+    'cache_size': -env.int('SQLITE_CACHE_KB', default=32 * 1024), # Negative: KiB per connection
+    'temp_store': 'MEMORY',
+}
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': env.int('CONN_MAX_AGE', default=600 if _PRODUCTION_DB else 0),
+        'CONN_HEALTH_CHECKS': _PRODUCTION_DB,
+        'OPTIONS': SQLITE_PRODUCTION_OPTIONS if _PRODUCTION_DB else {},
     }
 }
+SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS if _PRODUCTION_DB else {}
 # If you use a different database, you can configure it using dj-database-url and .env
 # Example for PostgreSQL:
 # DATABASES = {
@@ -133,6 +155,55 @@ DATABASES = {
 # }
 
 
+# Cache used for API responses (see HomePage.cache). LocMemCache is per process, so
+# with several server processes set CACHE_URL to a shared backend, e.g.
+# filecache:///var/tmp/stac_cache or redis://..., or invalidations won't reach them all.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+# Response compression (api.compression): bodies shorter than this are sent as-is, and
+# compressed copies of shareable responses are kept in the cache this long
+COMPRESSION_MIN_LENGTH = env.int('COMPRESSION_MIN_LENGTH', default=200)
+COMPRESSION_CACHE_TIMEOUT = env.int('COMPRESSION_CACHE_TIMEOUT', default=86400)
+# Seconds a cached /api/homepage/ response lives; signals invalidate it on every change
+HOMEPAGE_CACHE_TIMEOUT = env.int('HOMEPAGE_CACHE_TIMEOUT', default=3600)
+
+
+# Mixed into every API ETag; change it when a deploy changes response formats,
+# so clients holding old bodies can't get a 304 for them
+API_ETAG_SALT = env('API_ETAG_SALT', default='1')
+# Opt-in cursor pagination (?page_size= / ?cursor=, see api.pagination)
+API_PAGE_SIZE = env.int('API_PAGE_SIZE', default=24)
+API_MAX_PAGE_SIZE = env.int('API_MAX_PAGE_SIZE', default=200)
+# Serialize the big read-only lists straight from .values() rows (see api.fastpath)
+API_FAST_SERIALIZATION = env.bool('API_FAST_SERIALIZATION', default=True)
+# Run the parts of aggregate API views (homepage, batch) concurrently, see api.concurrency
+API_CONCURRENT_PARTS = env.bool('API_CONCURRENT_PARTS', default=False)
+# Threads those parts run on, shared by all requests of a process
+API_PART_THREADS = env.int('API_PART_THREADS', default=16)
+# Most resources one /api/batch/ request may name
+API_BATCH_MAX_RESOURCES = env.int('API_BATCH_MAX_RESOURCES', default=10)
+# Directory to publish JSON snapshots of the API endpoints to on every change
+# (see api.snapshots); empty disables them. Absolute URLs in the snapshots use
+# API_SNAPSHOT_BASE_URL, whose host must be in ALLOWED_HOSTS.
+API_SNAPSHOT_DIR = env('API_SNAPSHOT_DIR', default='')
+API_SNAPSHOT_BASE_URL = env('API_SNAPSHOT_BASE_URL', default='http://localhost:8000')
+# Days deleted notifications are remembered for ?since= sync; clients with an
+# older cursor are sent the full list instead
+NOTIFICATION_TOMBSTONE_DAYS = env.int('NOTIFICATION_TOMBSTONE_DAYS', default=30)
+# Results /api/search/ returns without ?limit=, and the most it returns with it
+SEARCH_DEFAULT_LIMIT = env.int('SEARCH_DEFAULT_LIMIT', default=20)
+SEARCH_MAX_LIMIT = env.int('SEARCH_MAX_LIMIT', default=50)
+# Per-request timings (api.timing): measured unless REQUEST_TIMING is off, and
+# sent as a Server-Timing header unless SERVER_TIMING_HEADER is off
+REQUEST_TIMING = env.bool('REQUEST_TIMING', default=True)
+SERVER_TIMING_HEADER = env.bool('SERVER_TIMING_HEADER', default=True)
+# Requests slower than this (milliseconds) are logged with their SQL
+SLOW_REQUEST_MS = env.int('SLOW_REQUEST_MS', default=500)
+# Timings kept per route for /timings/
+REQUEST_TIMING_WINDOW = env.int('REQUEST_TIMING_WINDOW', default=500)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -168,6 +239,42 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles_collected') # For collectstati
 # Media files (User-uploaded content)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Serve MEDIA_ROOT from Django (on in development). Needed for AVIF/WebP/JPEG negotiation
+# unless the front web server does the same Accept-based selection.
+SERVE_MEDIA = env.bool('SERVE_MEDIA', default=DEBUG)
+
+# Uploads are stored under the SHA-256 of their content so identical images
+# are stored and processed once (see imaging.storage.ContentAddressedStorage)
+STORAGES = {
+    'default': {
+        'BACKEND': 'imaging.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Background image processing (imaging app, run with `python manage.py run_image_worker`)
+IMAGE_JOB_MAX_ATTEMPTS = env.int('IMAGE_JOB_MAX_ATTEMPTS', default=3)
+IMAGE_JOB_RETRY_DELAY = env.int('IMAGE_JOB_RETRY_DELAY', default=30) # Seconds, doubled on every retry
+IMAGE_JOB_STALE_AFTER = env.int('IMAGE_JOB_STALE_AFTER', default=600) # Requeue jobs RUNNING longer than this
+IMAGE_WORKER_POLL_INTERVAL = env.float('IMAGE_WORKER_POLL_INTERVAL', default=2.0)
+# Widths (px) of the responsive WebP copies generated for srcset
+IMAGE_DERIVATIVE_WIDTHS = env.list('IMAGE_DERIVATIVE_WIDTHS', cast=int, default=[160, 320, 720, 1440])
+# Formats written next to every WebP derivative, picked by Accept header when serving
+# (formats this Pillow build can't encode are skipped; AVIF needs Pillow 11.2+)
+IMAGE_EXTRA_FORMATS = env.list('IMAGE_EXTRA_FORMATS', default=['avif', 'jpeg'])
+# Uploads larger than this are rejected outright (decompression bomb protection)
+IMAGE_MAX_SOURCE_PIXELS = env.int('IMAGE_MAX_SOURCE_PIXELS', default=120_000_000)
+# Most pixels decoded at once while processing; JPEGs are decoded at reduced scale to stay under it
+IMAGE_DECODE_PIXEL_BUDGET = env.int('IMAGE_DECODE_PIXEL_BUDGET', default=40_000_000)
+
+# On-demand resizing at /media-resize/<width>x<height>/<path> (see imaging.resize)
+IMAGE_RESIZE_DIMENSIONS = set(env.list('IMAGE_RESIZE_DIMENSIONS', cast=int, default=[0, 160, 320, 480, 720, 1080, 1440])) # 0 = unbounded
+IMAGE_RESIZE_QUALITIES = set(env.list('IMAGE_RESIZE_QUALITIES', cast=int, default=[60, 75, 90]))
+IMAGE_RESIZE_CACHE_DIR = env('IMAGE_RESIZE_CACHE_DIR', default=os.path.join(BASE_DIR, 'resize_cache'))
+IMAGE_RESIZE_CACHE_MAX_BYTES = env.int('IMAGE_RESIZE_CACHE_MAX_BYTES', default=512 * 1024 * 1024)
+IMAGE_RESIZE_MAX_AGE = env.int('IMAGE_RESIZE_MAX_AGE', default=86400) # Cache-Control max-age of resized responses
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -175,7 +282,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'api.timing.TimedJSONRenderer', # DRF's JSONRenderer, counted in the Server-Timing serialize part
         # Add BrowsableAPIRenderer if you want it during development
         # 'rest_framework.renderers.BrowsableAPIRenderer',
     ],
@@ -0,0 +1,10 @@
+# STAC/stats.py
+"""Small statistics helpers shared by the request timings and the benchmarks."""
+import math
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -1,6 +1,8 @@
 # STAC/urls.py
+import re
+
 from django.contrib import admin
-from django.urls import path, include # Make sure include is imported
+from django.urls import path, re_path, include # Make sure include is imported
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -25,8 +27,14 @@ from Gallery.views import PhotoGalleryListAPIView, VideoGalleryListAPIView
 
 # No need to import notification views here if we are using include('notification.urls')
 
+from api.timing import timings_view
+from api.views import BatchView
+from imaging.views import media, resized_image
+from search.views import SearchView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('timings/', timings_view, name='request_timings'), # Per-route request timings (staff only, see api.timing)
     path("reload/", include("django_browser_reload.urls")), # Project-level reload
 
     # --- API Endpoints ---
@@ -51,6 +59,15 @@ urlpatterns = [
     # Notification API Endpoints
     path('api/notifications/', include('notification.urls')), # <<< THIS LINE IS NOW CORRECTLY ADDED
 
+    # Several of the endpoints above in one request, e.g. /api/batch/?r=homepage,events.astrax
+    path('api/batch/', BatchView.as_view(), name='api_batch'),
+
+    # Full-text search, e.g. /api/search/?q=nebula
+    path('api/search/', SearchView.as_view(), name='api_search'),
+
+    # On-demand resized media, e.g. /media-resize/320x0/cas/ab/abcd....jpg
+    path('media-resize/<int:width>x<int:height>/<path:path>', resized_image, name='media_resize'),
+
     # --- App Page View Includes ---
     # (These include the app-specific urls.py files for their template-based pages)
     path('', include('Events.urls')), # For /astrax, /zenith, etc. (page views)
@@ -63,7 +80,8 @@ urlpatterns = [
     # ...etc.
 ]
 
-# Serve media and static files during development
+# Serve media (with AVIF/WebP/JPEG negotiation, see imaging.views.media) and static files
+if settings.SERVE_MEDIA:
+    urlpatterns += [re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), media)]
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT) # Good to explicitly add static for dev
\ No newline at end of file
@@ -0,0 +1,20 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api'
+
+    def ready(self):
+        from django.conf import settings
+        from django.db.backends.signals import connection_created
+
+        from .snapshots import publish_on_commit
+        from .sqlite import apply_pragmas
+        from .timing import install_query_timer
+        from .versions import model_changed
+
+        connection_created.connect(apply_pragmas, dispatch_uid='api_sqlite_pragmas')
+        connection_created.connect(install_query_timer, dispatch_uid='api_query_timer')
+        if settings.API_SNAPSHOT_DIR:
+            model_changed.connect(publish_on_commit, dispatch_uid='api_snapshots')
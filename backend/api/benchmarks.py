@@ -0,0 +1,285 @@
+# api/benchmarks.py
+"""
+Load benchmarks of the API, in-process:
+
+* run_benchmark(): the WSGI and the ASGI handler, each with the parts of
+  aggregate views run one after the other and concurrently
+  (api.concurrency), run with ``python manage.py bench_api_concurrency``;
+* run_read_write_benchmark(): API reads while the admin saves gallery
+  photos, with and without the production SQLite profile (api.sqlite), run
+  with ``python manage.py bench_sqlite``.
+
+run_benchmark() sends requests through the whole middleware stack, without
+a network:
+
+* wsgi: N threads each sending requests through Django's WSGI handler,
+  like a threaded WSGI server (gunicorn --threads N).
+* asgi: N concurrent requests on one event loop through Django's
+  ASGIHandler, given the HTTP scope and messages a server such as uvicorn
+  would send.
+
+Each runs with API_CONCURRENT_PARTS off, then on.
+
+In both, the cache is switched to a dummy backend and requests carry no
+Accept-Encoding or validators, so every request does the full database and
+serialization work. run_benchmark()'s ``db_latency`` adds a delay to every
+query, to mimic a database server across a network rather than a local
+SQLite file.
+"""
+import asyncio
+import io
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from PIL import Image
+
+from STAC.stats import percentile
+
+DEFAULT_PATHS = ['/api/homepage/', '/api/batch/?r=homepage,alumni,notifications.active', '/api/alumni/', '/api/notifications/active/']
+
+DUMMY_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def _delay_queries(seconds):
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+    return install
+
+
+def _check(status, path):
+    if status != 200:
+        raise RuntimeError(f"{path} returned {status}")
+
+
+def _run_wsgi(paths, requests, concurrency):
+    def fetch(i):
+        path = paths[i % len(paths)]
+        start = time.perf_counter()
+        _check(Client().get(path).status_code, path)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        return list(pool.map(fetch, range(requests)))
+
+
+async def _asgi_get(application, path):
+    """GET ``path`` from the ASGI ``application`` the way a server would; the response status."""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', b'testserver')], 'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    requested = False
+    status = None
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await asyncio.Future() # The client stays connected until the handler is done with it
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+async def _run_asgi(application, paths, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(i):
+        path = paths[i % len(paths)]
+        async with semaphore:
+            start = time.perf_counter()
+            _check(await _asgi_get(application, path), path)
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*(fetch(i) for i in range(requests)))
+
+
+def run_benchmark(paths=DEFAULT_PATHS, requests=200, concurrency=16, db_latency=0.0, progress=None):
+    """Run ``requests`` requests over ``paths`` on each handler, with parts sequential and concurrent; a report row per run."""
+    receiver = _delay_queries(db_latency) if db_latency else None
+    if receiver is not None:
+        connection_created.connect(receiver, weak=False)
+    report = []
+    try:
+        with override_settings(CACHES=DUMMY_CACHES, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            application = ASGIHandler()
+            for handler in ('wsgi', 'asgi'):
+                for concurrent_parts in (False, True):
+                    with override_settings(API_CONCURRENT_PARTS=concurrent_parts):
+                        # One warm-up round, so imports and connections don't count
+                        if handler == 'wsgi':
+                            _run_wsgi(paths, len(paths), 1)
+                            start = time.perf_counter()
+                            latencies = _run_wsgi(paths, requests, concurrency)
+                        else:
+                            asyncio.run(_run_asgi(application, paths, len(paths), 1))
+                            start = time.perf_counter()
+                            latencies = asyncio.run(_run_asgi(application, paths, requests, concurrency))
+                    elapsed = time.perf_counter() - start
+                    latencies = [latency * 1000 for latency in latencies]
+                    row = {
+                        'handler': handler,
+                        'concurrent_parts': concurrent_parts,
+                        'requests': requests,
+                        'concurrency': concurrency,
+                        'db_latency_ms': db_latency * 1000,
+                        'requests_per_s': requests / elapsed,
+                        'p50_ms': percentile(latencies, 50),
+                        'p90_ms': percentile(latencies, 90),
+                        'p99_ms': percentile(latencies, 99),
+                    }
+                    report.append(row)
+                    if progress:
+                        progress(row)
+    finally:
+        if receiver is not None:
+            connection_created.disconnect(receiver)
+    return report
+
+
+def _database_copy(directory, profile):
+    """A copy of the default database for ``profile``, in its journal mode."""
+    path = os.path.join(directory, f'{profile}.sqlite3')
+    source = sqlite3.connect(connections['default'].settings_dict['NAME'])
+    target = sqlite3.connect(path)
+    source.backup(target)
+    source.close()
+    target.execute('PRAGMA journal_mode = %s' % ('WAL' if profile == 'production' else 'DELETE'))
+    target.close()
+    return path
+
+
+def _gallery_images(count):
+    """``count`` different small JPEGs, like photos uploaded through the admin."""
+    images = []
+    for i in range(count):
+        buffer = io.BytesIO()
+        Image.new('RGB', (640, 480), (i * 37 % 256, i * 91 % 256, i * 53 % 256)).save(buffer, 'JPEG', quality=85)
+        images.append(buffer.getvalue())
+    return images
+
+
+def _use_database(path, profile):
+    """Point new connections at ``path`` with the settings of ``profile``."""
+    production = profile == 'production'
+    connections['default'].close()
+    connections.settings['default'].update({
+        'NAME': path,
+        'CONN_MAX_AGE': 600 if production else 0,
+        'OPTIONS': settings.SQLITE_PRODUCTION_OPTIONS if production else {},
+    })
+    connections['default'].settings_dict = connections.settings['default']
+
+
+def run_read_write_benchmark(duration=10.0, readers=8, write_interval=0.05, path='/api/gallery/photos/', progress=None):
+    """
+    Read latency of ``path`` from ``readers`` threads while another thread
+    saves a gallery photo with an image every ``write_interval`` seconds,
+    the way the admin does (row, StoredImage, ImageJob and ModelVersion in
+    one transaction). Runs on copies of the database, once without and once
+    with the production SQLite profile (api.sqlite). A report row per profile.
+    """
+    from Gallery.models import PhotoGallery
+
+    images = _gallery_images(20)
+    original = dict(connections.settings['default'])
+    report = []
+    with tempfile.TemporaryDirectory() as directory, override_settings(
+        CACHES=DUMMY_CACHES,
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        MEDIA_ROOT=os.path.join(directory, 'media'),
+        API_SNAPSHOT_DIR=os.path.join(directory, 'snapshots'),
+    ):
+        try:
+            for profile in ('default', 'production'):
+                _use_database(_database_copy(directory, profile), profile)
+                pragmas = settings.SQLITE_PRODUCTION_PRAGMAS if profile == 'production' else {}
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    row = _read_while_writing(PhotoGallery, images, duration, readers, write_interval, path)
+                row['profile'] = profile
+                report.append(row)
+                if progress:
+                    progress(row)
+        finally:
+            connections['default'].close()
+            connections.settings['default'].clear()
+            connections.settings['default'].update(original)
+            connections['default'].settings_dict = connections.settings['default']
+    return report
+
+
+def _read_while_writing(model, images, duration, readers, write_interval, path):
+    stop = threading.Event()
+    read_latencies, write_latencies = [], []
+    errors = {'read': 0, 'write': 0}
+
+    def read():
+        client = Client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                _check(client.get(path), path)
+            except Exception:
+                errors['read'] += 1
+            else:
+                read_latencies.append((time.perf_counter() - start) * 1000)
+        connections.close_all()
+
+    def write():
+        i = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    photo = model(name=f'bench {uuid.uuid4().hex[:12]}', description='<p>Benchmark</p>')
+                    photo.image.save(f'bench-{i}.jpg', ContentFile(images[i % len(images)]), save=False)
+                    photo.save()
+            except Exception:
+                errors['write'] += 1
+            else:
+                write_latencies.append((time.perf_counter() - start) * 1000)
+            i += 1
+            stop.wait(write_interval)
+        connections.close_all()
+
+    threads = [threading.Thread(target=read) for _ in range(readers)] + [threading.Thread(target=write)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        'reads': len(read_latencies),
+        'read_p50_ms': percentile(read_latencies, 50) if read_latencies else None,
+        'read_p99_ms': percentile(read_latencies, 99) if read_latencies else None,
+        'read_max_ms': max(read_latencies, default=None),
+        'writes': len(write_latencies),
+        'write_p50_ms': percentile(write_latencies, 50) if write_latencies else None,
+        'read_errors': errors['read'],
+        'write_errors': errors['write'],
+    }
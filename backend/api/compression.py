@@ -0,0 +1,156 @@
+# api/compression.py
+"""
+Brotli/gzip compression of API and page responses (CompressionMiddleware).
+
+JSON and HTML bodies here compress 5-10x. Responses are compressed at a
+fast level (Brotli 4, gzip 6: a few milliseconds for a 200 KB list),
+except shareable ones: those with an ETag, not marked private or no-store,
+for a URL without a query string. Those are the plain API lists, which
+return identical bodies between edits. They get the highest levels (about
+100x slower for Brotli, 10-20% smaller), and the result is kept in the
+Django cache under a hash of the uncompressed body and the encoding, so
+repeated hits only pay for hashing the body. Query strings (search terms,
+cursors, ?since=, batch resource lists) make bodies close to unique, and
+caching them would only fill the cache with entries never hit again.
+
+Responses that may carry secrets (a CSRF token, a logged-in user's page,
+cookies being set) are never cached. They are gzipped per request with
+random padding against BREACH, as Django's GZipMiddleware does.
+
+Brotli is used when the ``brotli`` package is installed and the client
+accepts it; otherwise gzip.
+"""
+import gzip
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError: # Optional; gzip only without it
+    brotli = None
+
+BROTLI_FAST_QUALITY = 4
+GZIP_FAST_LEVEL = 6
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+
+
+def accepted_encodings(accept_encoding):
+    """Content codings in an Accept-Encoding header with a non-zero q value."""
+    accepted = set()
+    for part in accept_encoding.split(','):
+        coding, *params = (p.strip() for p in part.split(';'))
+        q = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding):
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(content, encoding, best=False):
+    """``content`` compressed with ``encoding``: at the highest level if ``best`` (for cached results), otherwise fast."""
+    if encoding == 'br':
+        return brotli.compress(content, quality=11 if best else BROTLI_FAST_QUALITY)
+    return gzip.compress(content, compresslevel=9 if best else GZIP_FAST_LEVEL, mtime=0)
+
+
+def is_shareable(request, response):
+    """Whether ``response`` is worth compressing at the highest level and caching (see module docstring)."""
+    if not response.has_header('ETag') or request.META.get('QUERY_STRING'):
+        return False
+    cache_control = response.get('Cache-Control', '').lower()
+    return 'private' not in cache_control and 'no-store' not in cache_control
+
+
+def may_have_secrets(request, response):
+    """Whether ``response`` may contain data an attacker could recover through compressed sizes."""
+    if response.cookies or request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        return True
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_authenticated
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses for clients that accept it, re-using cached
+    compressed bodies (see module docstring). Goes near the top of
+    MIDDLEWARE, like Django's GZipMiddleware, which it replaces. Under ASGI
+    the compression runs in the thread pool, off the event loop.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.compress_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return await sync_to_async(self.compress_response, thread_sensitive=False)(request, response)
+
+    def compress_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        content = response.content
+        if len(content) < settings.COMPRESSION_MIN_LENGTH:
+            return response
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        if may_have_secrets(request, response):
+            encoding = 'gzip' if 'gzip' in accepted_encodings(request.headers.get('Accept-Encoding', '')) else None
+            if encoding is None:
+                return response
+            compressed = compress_string(content, max_random_bytes=GZipMiddleware.max_random_bytes) # Padded against BREACH
+        elif not is_shareable(request, response):
+            compressed = compress(content, encoding)
+        else:
+            key = f"compressed:{encoding}:{hashlib.sha1(content).hexdigest()}"
+            compressed = cache.get(key)
+            if compressed is None:
+                compressed = compress(content, encoding, best=True)
+                cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+        if len(compressed) >= len(content):
+            return response
+
+        response.content = compressed
+        response['Content-Encoding'] = encoding
+        response['Content-Length'] = str(len(compressed))
+        # The body differs from the uncompressed one, so a strong ETag must become weak
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
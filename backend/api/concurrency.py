@@ -0,0 +1,68 @@
+# api/concurrency.py
+"""
+Concurrent parts for API views made of independent pieces (AggregateMixin):
+the homepage's four lists and the batch endpoint's resources.
+
+Requests already run side by side under either server: a threaded WSGI
+server gives each request its own thread, and Django's ASGIHandler runs each
+request's sync code in a ThreadSensitiveContext of its own. Within one
+request, though, the parts of an aggregate view run one after the other.
+With API_CONCURRENT_PARTS on, ``run_parts()`` hands them to a pool of
+API_PART_THREADS threads and waits for all of them, so the response takes
+about as long as its slowest part rather than the sum. Parts of a part
+(the homepage inside a batch) run in the part's thread, so the pool can't
+deadlock on itself.
+
+That only pays when the parts wait on I/O, e.g. a database server across
+a network, and the server has CPU to spare: with 5 ms added to every
+query and one request at a time, the p90 latency (the batch and homepage
+requests) drops from 60 to 36 ms. On a local SQLite file, or with the CPU
+busy serving other requests, the threads just add overhead: on one CPU
+with 16 requests in flight, throughput falls from 141 to 94 requests/s
+under WSGI and from 84 to 75 under ASGI. Hence off by default;
+``python manage.py bench_api_concurrency`` measures a deployment.
+
+Each part runs on its pool thread's own database connection, so it sees
+committed data only.
+"""
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+_local = threading.local()
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(settings.API_PART_THREADS, thread_name_prefix='api-part')
+    return _executor
+
+
+def _call_part(part):
+    _local.in_part = True
+    try:
+        return part()
+    finally:
+        _local.in_part = False
+        # Pool threads don't see request_finished, so give connections the same treatment here
+        close_old_connections()
+
+
+class AggregateMixin:
+    """
+    For views whose response is made of independent parts: the view calls
+    ``run_parts()`` with them, which runs them concurrently when
+    API_CONCURRENT_PARTS is on and one after the other otherwise.
+    """
+    def run_parts(self, parts):
+        """``{name: part()}`` for the ``{name: callable}`` ``parts``."""
+        if not settings.API_CONCURRENT_PARTS or len(parts) < 2 or getattr(_local, 'in_part', False):
+            return {name: part() for name, part in parts.items()}
+        # Each part gets a copy of the request's context (e.g. api.timing's timer)
+        futures = {name: _pool().submit(contextvars.copy_context().run, _call_part, part) for name, part in parts.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,175 @@
+# api/fastpath.py
+"""
+Fast read path for large read-only lists (see FastListMixin).
+
+DRF builds a model instance per row and calls every field's
+to_representation through the serializer machinery, which dominates CPU
+on lists of a few thousand rows. Here the view's serializer is "compiled"
+once per request into plain functions over ``.values()`` rows: the
+column each field reads and how to turn it into output. Image URLs are
+joined to an absolute media base computed once, instead of calling
+request.build_absolute_uri() per object. The output is identical to the
+serializer's (see api/tests.py). Serializers with fields this module
+doesn't know (method fields, custom formats, ...) take the normal path.
+"""
+import datetime
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from imaging.serializers import ImageMetaField, ImageSrcsetField
+
+from .timing import TimedListMixin, timed
+
+try:
+    import orjson
+except ImportError: # Optional; the standard library encoder is used without it
+    orjson = None
+
+# Fields whose to_representation returns database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.EmailField, serializers.URLField,
+    serializers.IntegerField, serializers.BooleanField, serializers.ReadOnlyField,
+)
+
+
+def dumps(data):
+    """JSON bytes, byte for byte what DRF's JSONRenderer would produce."""
+    if orjson is not None:
+        content = orjson.dumps(data)
+    else:
+        content = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode()
+    # Like JSONRenderer, escape the line separators that are valid JSON but not valid JavaScript
+    if b'\xe2\x80' in content:
+        content = content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+    return content
+
+
+def _media_base(request, model, field_name):
+    """Absolute URL prefix of files in ``model.field_name``'s storage."""
+    storage = model._meta.get_field(field_name).storage
+    base = storage.base_url
+    return request.build_absolute_uri(base) if request is not None else base
+
+
+def _file_url(base):
+    def convert(name):
+        return base + filepath_to_uri(name).lstrip('/') if name else None
+    return convert
+
+
+def _srcset(base):
+    def convert(meta):
+        return [
+            {'url': base + filepath_to_uri(entry['name']).lstrip('/'), 'width': entry['width'], 'height': entry['height']}
+            for entry in (meta or {}).get('srcset', ())
+        ]
+    return convert
+
+
+def _meta_value(key):
+    def convert(meta):
+        return None if meta is None else meta.get(key)
+    return convert
+
+
+def _datetime(tz):
+    def convert(value):
+        if tz is not None:
+            value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+        elif timezone.is_aware(value):
+            value = timezone.make_naive(value, datetime.timezone.utc)
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _converter(field, model, request):
+    """``(column, convert)`` reproducing ``field``'s output, or None if it isn't supported."""
+    if isinstance(field, ImageSrcsetField):
+        return 'image_meta', _srcset(_media_base(request, model, 'image'))
+    if isinstance(field, ImageMetaField):
+        return 'image_meta', _meta_value(field.key)
+    if field.source == '*' or len(field.source_attrs) != 1:
+        return None
+    column = field.source
+    try:
+        model._meta.get_field(column)
+    except FieldDoesNotExist:
+        return None
+    if type(field) in (serializers.FileField, serializers.ImageField):
+        if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            return None
+        return column, _file_url(_media_base(request, model, column))
+    if type(field) is serializers.DateTimeField:
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() != ISO_8601:
+            return None
+        tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        return column, _datetime(tz)
+    if type(field) in PASSTHROUGH_FIELDS:
+        return column, None
+    return None
+
+
+def compile_serializer(serializer, request):
+    """
+    ``(columns, fields)`` for serializing ``serializer``'s model from
+    ``.values(*columns)`` rows, where ``fields`` is [(output name, column,
+    convert or None)]; or None if some field needs the full serializer.
+    """
+    model = serializer.Meta.model
+    columns = []
+    fields = []
+    for name, field in serializer.fields.items():
+        converter = _converter(field, model, request)
+        if converter is None:
+            return None
+        column, convert = converter
+        if column not in columns:
+            columns.append(column)
+        fields.append((name, column, convert))
+    return columns, fields
+
+
+def serialize_rows(rows, fields):
+    data = []
+    for row in rows:
+        item = {}
+        for name, column, convert in fields:
+            value = row[column]
+            item[name] = value if convert is None or value is None else convert(value)
+        data.append(item)
+    return data
+
+
+class FastListMixin(TimedListMixin):
+    """
+    For read-only ListAPIViews: serialize through compile_serializer()
+    when the serializer allows it and API_FAST_SERIALIZATION is on, and fall
+    back to the normal DRF path otherwise. Works with cursor pagination,
+    ?fields=/?omit= and ConditionalListMixin.
+    """
+    def list(self, request, *args, **kwargs):
+        compiled = compile_serializer(self.get_serializer(), request) if settings.API_FAST_SERIALIZATION else None
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+        columns, fields = compiled
+
+        ordering = getattr(self, 'cursor_ordering', None) # Read from the rows by cursor pagination
+        extra = [ordering.lstrip('-')] if ordering and ordering.lstrip('-') not in columns else []
+        rows = self.filter_queryset(self.get_queryset()).values(*columns, *extra)
+        page = self.paginate_queryset(rows)
+        with timed('serialize'): # Unpaginated rows are queried in here; timed() leaves the query out
+            if page is not None:
+                data = self.get_paginated_response(serialize_rows(page, fields)).data
+            else:
+                data = serialize_rows(rows, fields)
+            body = dumps(data)
+        return HttpResponse(body, content_type='application/json')
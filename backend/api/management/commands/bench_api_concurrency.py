@@ -0,0 +1,38 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks import DEFAULT_PATHS, run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API under load through the WSGI and the ASGI handler, each with the parts "
+        "of aggregate views run one after the other and concurrently (see api.concurrency), "
+        "against the current database. Reports throughput and latency percentiles per run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per run (default: 200).")
+        parser.add_argument('--concurrency', type=int, default=16, help="Requests in flight at once (default: 16).")
+        parser.add_argument('--db-latency', type=float, default=0.0, help="Milliseconds added to every query, to mimic a remote database.")
+        parser.add_argument('--path', action='append', dest='paths', help=f"Path to request; repeat for several (default: {', '.join(DEFAULT_PATHS)}).")
+        parser.add_argument('--json', dest='json_path', help="Also write the report as JSON to this file.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'handler':<9}{'parts':<12}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+
+        def progress(row):
+            parts = 'concurrent' if row['concurrent_parts'] else 'sequential'
+            self.stdout.write(
+                f"{row['handler']:<9}{parts:<12}{row['requests_per_s']:>10.1f}{row['p50_ms']:>10.1f}{row['p90_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+            )
+
+        report = run_benchmark(
+            options['paths'] or DEFAULT_PATHS, options['requests'], options['concurrency'],
+            options['db_latency'] / 1000, progress=progress,
+        )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['json_path']}"))
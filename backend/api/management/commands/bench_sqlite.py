@@ -0,0 +1,46 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from api.benchmarks import run_read_write_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure API read latency while gallery photos are being saved, on copies of the "
+        "database with the default and the production SQLite profile (see api.sqlite)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per profile (default: 10).")
+        parser.add_argument('--readers', type=int, default=8, help="Concurrent reader threads (default: 8).")
+        parser.add_argument('--write-interval', type=float, default=0.05, help="Seconds between saves (default: 0.05).")
+        parser.add_argument('--path', default='/api/gallery/photos/', help="Endpoint the readers request (default: /api/gallery/photos/).")
+        parser.add_argument('--json', dest='json_path', help="Also write the report as JSON to this file.")
+
+    def handle(self, *args, **options):
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError("The default database isn't SQLite")
+
+        def ms(value):
+            return 'n/a' if value is None else f'{value:.1f}'
+
+        self.stdout.write(
+            f"{'profile':<12}{'reads':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'writes':>8}{'write ms':>10}{'errors':>8}"
+        )
+
+        def progress(row):
+            self.stdout.write(
+                f"{row['profile']:<12}{row['reads']:>7}{ms(row['read_p50_ms']):>9}{ms(row['read_p99_ms']):>9}"
+                f"{ms(row['read_max_ms']):>9}{row['writes']:>8}{ms(row['write_p50_ms']):>10}"
+                f"{row['read_errors'] + row['write_errors']:>8}"
+            )
+
+        report = run_read_write_benchmark(
+            options['duration'], options['readers'], options['write_interval'], options['path'], progress=progress,
+        )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['json_path']}"))
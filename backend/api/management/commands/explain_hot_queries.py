@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.queryplans import explain_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the query plan (EXPLAIN QUERY PLAN on SQLite) of the query behind every public "
+        "API endpoint and the other hot paths, flagging sorts and filters without an index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sql', action='store_true', help="Also print each query's SQL.")
+        parser.add_argument('--check', action='store_true', help="Exit with an error if any plan is flagged, e.g. in CI.")
+
+    def handle(self, *args, **options):
+        flagged = 0
+        for name, sql, plan, warnings in explain_all():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            if options['sql']:
+                self.stdout.write(f"  {sql}")
+            for line in plan.splitlines():
+                self.stdout.write(f"    {line}")
+            for warning in warnings:
+                self.stdout.write(self.style.WARNING(f"  ! {warning}"))
+            flagged += bool(warnings)
+
+        if flagged and options['check']:
+            raise CommandError(f"{flagged} query plan(s) flagged")
+        self.stdout.write(self.style.SUCCESS(f"{flagged} query plan(s) flagged."))
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.snapshots import endpoints, publish
+
+
+class Command(BaseCommand):
+    help = (
+        "Write JSON snapshots of the public API endpoints to API_SNAPSHOT_DIR "
+        "(see api.snapshots). Only endpoints whose data changed are re-rendered "
+        "unless --force is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Re-render every endpoint, e.g. after a deploy changed response formats.")
+
+    def handle(self, *args, **options):
+        if not settings.API_SNAPSHOT_DIR:
+            raise CommandError("API_SNAPSHOT_DIR is not set")
+
+        written = publish(force=options['force'])
+        for path in written:
+            self.stdout.write(f"  {path}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Published {len(written)} of {len(endpoints())} endpoint(s) to {settings.API_SNAPSHOT_DIR}."
+        ))
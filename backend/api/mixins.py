@@ -0,0 +1,62 @@
+# api/mixins.py
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .serializers import sparse_queryset
+from .versions import get_versions
+
+
+class ConditionalListMixin:
+    """
+    ETag/Last-Modified for read-only API views, from the ModelVersion rows
+    of ``version_models`` (default: the queryset's model). A request with
+    a matching If-None-Match or If-Modified-Since gets a 304 straight
+    away, without the view querying or serializing anything.
+    """
+    version_models = None
+
+    def get_version_models(self):
+        return self.version_models or [self.queryset.model]
+
+    def get_validators(self):
+        """``(etag, last_modified timestamp)`` of the current data."""
+        models = self.get_version_models()
+        versions, modified = get_versions(models)
+        raw = '|'.join([
+            settings.API_ETAG_SALT,
+            type(self).__qualname__,
+            *(f'{model._meta.label}:{version}' for model, version in zip(models, versions)),
+        ])
+        etag = 'W/' + quote_etag(hashlib.sha1(raw.encode()).hexdigest()[:20])
+        return etag, modified and int(modified.timestamp())
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+            # Let clients keep the body but check back every time; a 304 is cheap
+            patch_cache_control(response, no_cache=True)
+        return response
+
+
+class SparseQuerysetMixin:
+    """
+    For list views whose serializer uses api.serializers.SparseFieldsMixin:
+    when ``?fields=`` or ``?omit=`` is given, only the columns the remaining
+    fields read are selected, plus ``get_required_columns()``.
+    """
+    def get_required_columns(self):
+        """Columns the view itself reads from the rows."""
+        ordering = getattr(self, 'cursor_ordering', None) # Read from the rows by cursor pagination
+        return [ordering.lstrip('-')] if ordering else []
+
+    def get_queryset(self):
+        return sparse_queryset(super().get_queryset(), self.get_serializer(), self.get_required_columns())
@@ -0,0 +1,30 @@
+# api/models.py
+from django.db import models
+from django.utils import timezone
+
+
+class ModelVersionQuerySet(models.QuerySet):
+    def bump(self, model):
+        """Record a change to ``model``'s table."""
+        label = model._meta.label
+        now = timezone.now()
+        if self.filter(label=label).update(version=models.F('version') + 1, modified=now):
+            return
+        _, created = self.get_or_create(label=label, defaults={'version': 1, 'modified': now})
+        if not created: # Another process created the row first
+            self.filter(label=label).update(version=models.F('version') + 1, modified=now)
+
+
+class ModelVersion(models.Model):
+    """
+    Change counter and time per tracked model (see api.versions), so API
+    views can answer conditional requests without touching the model's rows.
+    """
+    label = models.CharField(max_length=100, unique=True) # app_label.ModelName
+    version = models.PositiveBigIntegerField(default=0)
+    modified = models.DateTimeField(default=timezone.now)
+
+    objects = ModelVersionQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.label} v{self.version}"
@@ -0,0 +1,29 @@
+# api/pagination.py
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class OptInCursorPagination(CursorPagination):
+    """
+    Keyset pagination that only kicks in when the client asks for it with
+    ``?page_size=`` or ``?cursor=``; without either, the view returns the
+    whole list as before. Pages are fetched with ``WHERE <column> > <last
+    seen value>`` on the view's ``cursor_ordering`` column (which should be
+    indexed), so page 500 costs the same as page 1, unlike OFFSET.
+
+    The response is ``{"next": url, "previous": url, "results": [...]}``.
+    """
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    ordering = '-pk'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', self.ordering)
+        return (ordering,) if isinstance(ordering, str) else tuple(ordering)
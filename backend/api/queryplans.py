@@ -0,0 +1,109 @@
+# api/queryplans.py
+"""
+The queries behind the public API endpoints and the other hot paths, with
+their query plans, for ``python manage.py explain_hot_queries``.
+
+Endpoint queries are taken from the views themselves (``get_queryset()``
+plus the view's filtering and cursor ordering), so the plans follow the
+code. Plans that sort without an index, or scan a whole table to apply a
+filter, are flagged: on anything beyond a few hundred rows those are the
+regressions to look at.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.test import RequestFactory
+from django.utils import timezone
+
+from imaging.models import ImageJob
+
+from .models import ModelVersion
+from .routes import api_views, view_models
+
+
+def _view_instance(path, view):
+    """The DRF view instance serving a plain GET for ``path``."""
+    request = RequestFactory().get(path)
+    instance = view.view_class(**view.view_initkwargs)
+    instance.setup(request)
+    instance.request = instance.initialize_request(request)
+    instance.format_kwarg = None
+    return instance
+
+
+def _cursor_page(queryset, ordering):
+    """A later cursor page of ``queryset``, as OptInCursorPagination fetches it."""
+    column = ordering.lstrip('-')
+    opts = queryset.model._meta
+    field = opts.pk if column == 'pk' else opts.get_field(column)
+    value = timezone.now() if isinstance(field, models.DateTimeField) else 0
+    lookup = f"{column}__{'lt' if ordering.startswith('-') else 'gt'}"
+    return queryset.order_by(ordering).filter(**{lookup: value})[:settings.API_PAGE_SIZE]
+
+
+def endpoint_queries():
+    """``[(name, queryset)]`` for every public API endpoint that reads the database directly."""
+    queries = []
+    for path, view in api_views().items():
+        view_class = getattr(view, 'view_class', None)
+        if view_class is None:
+            continue
+        if hasattr(view_class, 'get_queryset'):
+            instance = _view_instance(path, view)
+            queryset = instance.filter_queryset(instance.get_queryset())
+            queries.append((f"GET {path}", queryset))
+            ordering = getattr(instance, 'cursor_ordering', None)
+            if ordering and getattr(view_class, 'pagination_class', None):
+                queries.append((f"GET {path}?cursor=...", _cursor_page(queryset, ordering)))
+        else:
+            # Views building their response from several models, like /api/homepage/
+            for model in view_models(view):
+                queries.append((f"GET {path} ({model._meta.label})", model._default_manager.all()))
+    return queries
+
+
+def other_queries():
+    """``[(name, queryset)]`` of hot queries outside the list endpoints."""
+    from CoreTeam.models import MemberDetail
+    from notification.models import Notification, NotificationTombstone
+
+    now = timezone.now()
+    labels = [model._meta.label for model in (Notification, MemberDetail)]
+    return [
+        ("API conditional GET (ModelVersion)", ModelVersion.objects.filter(label__in=labels).values_list('label', 'version', 'modified')),
+        ("notifications ?since= changes", Notification.objects.filter(updated_at__gt=now).order_by('updated_at')),
+        ("notifications ?since= deletions", NotificationTombstone.objects.filter(deleted_at__gt=now).values_list('notification_id', flat=True)),
+        ("/coreteam/ page and /api/coreteam/?grouped=1", MemberDetail.objects.order_by('position', 'pk')),
+        ("image worker claim", ImageJob.objects.filter(status=ImageJob.PENDING, available_at__lte=now).order_by('available_at', 'pk')[:1]),
+    ]
+
+
+def _partial_indexes():
+    return {index.name for model in apps.get_models() for index in model._meta.indexes if index.condition is not None}
+
+
+def plan_warnings(queryset, plan, partial_indexes=()):
+    """
+    What looks wrong in the SQLite ``plan`` (the output of
+    queryset.explain()): a sort not served by an index, or a filter applied
+    by reading the whole table or index (a SCAN rather than a SEARCH), unless
+    the index is a partial one holding only the matching rows.
+    """
+    warnings = []
+    steps = [line.split(' ', 3)[-1] for line in plan.splitlines()]
+    if any('TEMP B-TREE' in step for step in steps):
+        warnings.append("sorts without an index")
+    scans = [step for step in steps if step.startswith('SCAN ')]
+    if queryset.query.where and any(step.split()[-1] not in partial_indexes for step in scans):
+        warnings.append("reads every row to filter them")
+    return warnings
+
+
+def explain_all():
+    """``[(name, sql, plan, warnings)]`` for every hot query."""
+    partial_indexes = _partial_indexes()
+    results = []
+    for name, queryset in endpoint_queries() + other_queries():
+        plan = queryset.explain()
+        results.append((name, str(queryset.query), plan, plan_warnings(queryset, plan, partial_indexes)))
+    return results
@@ -0,0 +1,41 @@
+# api/routes.py
+"""
+Discovery of the public API endpoints from the URLconf, shared by the
+batch endpoint (api.views) and JSON snapshots (api.snapshots).
+"""
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+def _walk(patterns, prefix=''):
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern):
+            yield route, pattern.callback
+
+
+def api_views():
+    """``{path: view}`` for every api/ route without URL parameters."""
+    return {
+        '/' + route: callback
+        for route, callback in _walk(get_resolver().url_patterns)
+        if route.startswith('api/') and '<' not in route and '^' not in route
+    }
+
+
+def resource_name(path):
+    """'/api/events/astrax/' -> 'events.astrax'"""
+    return path.strip('/').removeprefix('api/').replace('/', '.')
+
+
+def view_models(view):
+    """The models a view's response is built from: ``version_models``, or its queryset's model."""
+    view_class = getattr(view, 'view_class', None)
+    if view_class is None:
+        return ()
+    models = getattr(view_class, 'version_models', None)
+    if models:
+        return tuple(models)
+    queryset = getattr(view_class, 'queryset', None)
+    return (queryset.model,) if queryset is not None else ()
@@ -0,0 +1,77 @@
+# api/serializers.py
+from rest_framework import serializers
+
+
+def sparse_fieldset(request):
+    """
+    ``(fields, omit)`` from ``?fields=a,b`` and ``?omit=c``: the field names
+    to keep (None for all) and to drop. An empty ``?fields=`` keeps all.
+    """
+    def names(param):
+        value = request.query_params.get(param) if hasattr(request, 'query_params') else request.GET.get(param)
+        if value is None:
+            return None
+        return {name.strip() for name in value.split(',') if name.strip()} or None
+
+    return names('fields'), names('omit') or set()
+
+
+def sparse_queryset(queryset, serializer, extra=()):
+    """
+    ``queryset`` selecting only what ``serializer`` (a SparseFieldsMixin
+    instance) still outputs, plus the ``extra`` columns, if the request asked
+    for a sparse fieldset. Otherwise ``queryset`` unchanged.
+    """
+    only, omit = sparse_fieldset(serializer.context['request'])
+    if only is None and not omit:
+        return queryset
+    columns = serializer.selected_columns()
+    if columns is None:
+        return queryset
+    return queryset.only(*columns, *extra)
+
+
+class SparseFieldsMixin:
+    """
+    For ModelSerializers: honours ``?fields=`` and ``?omit=`` on the request
+    in the serializer context, so clients can skip fields they don't show
+    (e.g. the rich-text ``description`` on card grids). Unknown names are
+    ignored. Views use ``selected_columns()`` to leave the dropped columns
+    out of the SELECT too (see api.mixins.SparseQuerysetMixin).
+
+    ``field_columns`` maps fields that don't read a model field of their
+    own name (method fields, ``source='*'``) to the columns they need.
+    Fields declaring ``source_columns`` (e.g. imaging's ImageSrcsetField)
+    don't need an entry.
+    """
+    field_columns = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+        only, omit = sparse_fieldset(request)
+        for name in list(self.fields):
+            if (only is not None and name not in only) or name in omit:
+                self.fields.pop(name)
+
+    def selected_columns(self):
+        """
+        Model field names the remaining fields read, for ``QuerySet.only()``,
+        or None if some field's needs are unknown.
+        """
+        model = self.Meta.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+        columns = {model._meta.pk.name}
+        for name, field in self.fields.items():
+            if name in self.field_columns:
+                needed = self.field_columns[name]
+            elif field.source == '*':
+                needed = getattr(field, 'source_columns', None)
+            else:
+                needed = field.source_attrs[:1]
+            if needed is None or not concrete.issuperset(needed):
+                return None
+            columns.update(needed)
+        return columns
@@ -0,0 +1,172 @@
+# api/snapshots.py
+"""
+Pre-rendered JSON copies of the public GET endpoints, for the front web
+server or the Next.js build to read without calling Django.
+
+Enabled by setting API_SNAPSHOT_DIR. Every static ``api/...`` route whose
+view names its models (``version_models``, or the model of ``queryset``)
+is published. For /api/events/astrax/ that gives:
+
+    <API_SNAPSHOT_DIR>/events/astrax.json           always the latest body
+    <API_SNAPSHOT_DIR>/events/astrax.<version>.json immutable, cacheable forever
+    <API_SNAPSHOT_DIR>/manifest.json                endpoint -> current versioned file
+
+When a tracked model changes (api.versions.model_changed), the endpoints
+that use it are re-rendered after the transaction commits. All files are
+written to a temporary name and renamed into place, so readers never see
+a partial file. Each JSON file gets precompressed .gz (and, with the
+brotli package, .br) siblings for the web server to send as they are
+(e.g. nginx gzip_static/brotli_static).
+``python manage.py publish_snapshots`` rebuilds everything.
+"""
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.urls import resolve
+
+from .compression import brotli, compress
+from .routes import api_views, view_models
+from .versions import get_versions
+
+logger = logging.getLogger(__name__)
+
+KEEP_VERSIONS = 3 # Older versioned files are deleted; a few are kept for readers still fetching them
+
+
+def endpoints():
+    """``{path: models}`` for every publishable API endpoint."""
+    found = {}
+    for path, view in api_views().items():
+        models = view_models(view)
+        if models:
+            found[path] = models
+    return found
+
+
+def _file_stem(path):
+    """'/api/events/astrax/' -> 'events/astrax'"""
+    return path.strip('/').removeprefix('api/') or 'index'
+
+
+def _version(models):
+    versions, _ = get_versions(models)
+    raw = '|'.join(f'{model._meta.label}:{version}' for model, version in zip(models, versions))
+    return hashlib.sha1(f'{settings.API_ETAG_SALT}|{raw}'.encode()).hexdigest()[:12]
+
+
+def _request(path):
+    base = urlsplit(settings.API_SNAPSHOT_BASE_URL)
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'SERVER_NAME': base.hostname,
+        'SERVER_PORT': str(base.port or (443 if base.scheme == 'https' else 80)),
+        'HTTP_HOST': base.netloc,
+        'HTTP_ACCEPT': 'application/json',
+        'wsgi.url_scheme': base.scheme,
+        'wsgi.input': io.BytesIO(),
+    }
+    return WSGIRequest(environ)
+
+
+def render(path):
+    """The body the endpoint at ``path`` returns right now."""
+    match = resolve(path)
+    response = match.func(_request(path), *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code != 200:
+        raise ValueError(f"{path} returned {response.status_code}")
+    return response.content
+
+
+def _write_atomic(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Unique per thread too: a threaded server publishes from several requests at once
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+
+def _encodings():
+    return {'.gz': 'gzip', '.br': 'br'} if brotli is not None else {'.gz': 'gzip'}
+
+
+def _write_snapshot(path, content, compressed):
+    # Compressed siblings first, so a server preferring them never pairs a new .json with an old .gz
+    for suffix, body in compressed.items():
+        _write_atomic(path + suffix, body)
+    _write_atomic(path, content)
+
+
+def _prune(directory, stem, keep):
+    versioned = sorted(glob.glob(os.path.join(directory, f'{glob.escape(stem)}.*.json')), key=os.path.getmtime)
+    for path in versioned[:-keep]:
+        for suffix in ('', '.gz', '.br'):
+            try:
+                os.remove(path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+def publish(paths=None, force=False):
+    """
+    Re-render the endpoints at ``paths`` (default: all) whose data changed
+    since their last snapshot, or all of them if ``force``. Returns the
+    paths written.
+    """
+    directory = settings.API_SNAPSHOT_DIR
+    available = endpoints()
+    written = []
+    manifest = {}
+    for path, models in available.items():
+        stem = _file_stem(path)
+        filename = f'{stem}.{_version(models)}.json'
+        manifest[path] = filename
+        if paths is not None and path not in paths:
+            continue
+        versioned_path = os.path.join(directory, filename)
+        if os.path.exists(versioned_path) and not force:
+            continue
+        content = render(path)
+        compressed = {suffix: compress(content, encoding, best=True) for suffix, encoding in _encodings().items()}
+        _write_snapshot(versioned_path, content, compressed)
+        _write_snapshot(os.path.join(directory, f'{stem}.json'), content, compressed)
+        _prune(directory, stem, KEEP_VERSIONS)
+        written.append(path)
+
+    if written or not os.path.exists(os.path.join(directory, 'manifest.json')):
+        _write_atomic(os.path.join(directory, 'manifest.json'), json.dumps(manifest, indent=2).encode())
+    return written
+
+
+def _publish_for(model):
+    paths = [path for path, models in endpoints().items() if model in models]
+    if not paths:
+        return
+    try:
+        publish(paths)
+    except Exception:
+        # The change itself is committed; a later change or publish_snapshots catches up
+        logger.exception("Error publishing API snapshots for %s", model._meta.label)
+
+
+def publish_on_commit(sender, **kwargs):
+    """Receiver for api.versions.model_changed."""
+    transaction.on_commit(lambda: _publish_for(sender))
@@ -0,0 +1,377 @@
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from django.utils.cache import has_vary_header
+
+from Alumni.models import Alumni
+from CoreTeam.models import MemberDetail
+from HomePage.models import Achievements
+from Events.models import Astrax
+from Gallery.models import PhotoGallery
+from notification.models import Notification
+from imaging.signals import image_processed
+from search.index import FTS_TABLE, plain_text, search
+
+from .compression import compress
+from .queryplans import explain_all
+from .snapshots import KEEP_VERSIONS, publish
+from .timing import reset_stats, route_stats
+
+META = {
+    'original': 'images/photogallery/Ünïcode name.jpg',
+    'display': 'images/photogallery/Ünïcode name.720x1080.webp',
+    'width': 720,
+    'height': 480,
+    'placeholder': 'data:image/webp;base64,AAAA',
+    'srcset': [
+        {'name': 'images/photogallery/Ünïcode name.160w.webp', 'width': 160, 'height': 107, 'bytes': 10},
+        {'name': 'images/photogallery/Ünïcode name.320w.webp', 'width': 320, 'height': 213, 'bytes': 20},
+    ],
+}
+
+
+class FastPathParityTests(TestCase):
+    """The fast read path (api.fastpath) must return exactly what the serializers do."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            PhotoGallery.objects.create(name=f'photo {i}', description=f'<p>Photo {i} &amp; more</p>')
+            Alumni.objects.create(name=f'Alum {i}', email=f'alum{i}@example.com')
+            Notification.objects.create(title=f'Notice {i}', message='Hello', is_active=i % 2 == 0,
+                                        link=None if i % 2 else 'https://example.com/')
+        processed = PhotoGallery.objects.first()
+        PhotoGallery.objects.filter(pk=processed.pk).update(image=META['display'], image_meta=META)
+        PhotoGallery.objects.create(name='no image', image='')
+
+    def assertSameOutput(self, url):
+        fast = self.client.get(url)
+        with override_settings(API_FAST_SERIALIZATION=False):
+            slow = self.client.get(url)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(slow.status_code, 200)
+        self.assertEqual(fast.json(), slow.json())
+        return fast.json()
+
+    def test_photos(self):
+        data = self.assertSameOutput('/api/gallery/photos/')
+        self.assertEqual(len(data), 6)
+        self.assertTrue(data[0]['image_srcset'][0]['url'].startswith('http://testserver/media/'))
+
+    def test_alumni(self):
+        self.assertSameOutput('/api/alumni/')
+
+    def test_notifications(self):
+        self.assertSameOutput('/api/notifications/all/')
+        self.assertSameOutput('/api/notifications/active/')
+
+    def test_sparse_fields(self):
+        data = self.assertSameOutput('/api/gallery/photos/?fields=id,image,image_srcset')
+        self.assertEqual(set(data[0]), {'id', 'image', 'image_srcset'})
+        self.assertSameOutput('/api/notifications/all/?omit=message')
+
+    def test_empty_fields_keeps_all(self):
+        full = self.client.get('/api/gallery/photos/').json()
+        for query in ('fields=', 'fields=,', 'fields=&omit='):
+            with self.subTest(query=query):
+                self.assertEqual(self.assertSameOutput(f'/api/gallery/photos/?{query}'), full)
+
+    def test_cursor_pages(self):
+        page = self.assertSameOutput('/api/gallery/photos/?page_size=2')
+        self.assertEqual(len(page['results']), 2)
+        self.assertSameOutput(page['next'])
+        page = self.assertSameOutput('/api/notifications/all/?page_size=2')
+        self.assertSameOutput(page['next'])
+
+    def test_same_bytes(self):
+        Notification.objects.create(title='Line\u2028and paragraph\u2029separators', message='Ünïcode')
+        for url in ('/api/gallery/photos/', '/api/alumni/', '/api/notifications/all/'):
+            fast = self.client.get(url).content
+            with override_settings(API_FAST_SERIALIZATION=False):
+                self.assertEqual(fast, self.client.get(url).content)
+        self.assertIn(b'Line\\u2028and paragraph\\u2029separators', fast)
+
+    def test_batch_parts(self):
+        data = self.client.get('/api/batch/?r=gallery.photos,alumni').json()
+        self.assertEqual(data['gallery.photos']['data'], self.client.get('/api/gallery/photos/').json())
+        self.assertEqual(data['alumni']['data'], self.client.get('/api/alumni/').json())
+
+
+class ConditionalGetTests(TestCase):
+    URL = '/api/gallery/photos/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.photo = PhotoGallery.objects.create(name='Moon')
+        PhotoGallery.objects.create(name='Sun')
+
+    def test_not_modified(self):
+        response = self.client.get(self.URL)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        with self.assertNumQueries(1): # The versions only; nothing is listed
+            response = self.client.get(self.URL, headers={'If-None-Match': etag})
+        self.assertEqual((response.status_code, response.content), (304, b''))
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.URL, headers={'If-Modified-Since': last_modified}).status_code, 304)
+        self.assertEqual(self.client.get(self.URL, headers={'If-None-Match': 'W/"stale"'}).status_code, 200)
+
+    def test_etag_changes(self):
+        changes = {
+            'save': lambda: self.photo.save(),
+            'image_processed': lambda: image_processed.send(sender=PhotoGallery, pk=self.photo.pk),
+            'delete': lambda: self.photo.delete(),
+        }
+        for change, apply in changes.items():
+            with self.subTest(change=change):
+                etag = self.client.get(self.URL)['ETag']
+                apply()
+                response = self.client.get(self.URL, headers={'If-None-Match': etag})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+
+
+class NotificationSyncTests(TestCase):
+    """?since= on the notification lists (notification.sync)."""
+
+    def test_changes_since_cursor(self):
+        kept = Notification.objects.create(title='kept', message='.')
+        hidden = Notification.objects.create(title='hidden', message='.')
+        removed = Notification.objects.create(title='removed', message='.')
+        first = self.client.get('/api/notifications/active/?since=0').json()
+        self.assertTrue(first['full'])
+        self.assertEqual(len(first['notifications']), 3)
+
+        # Pretend the first sync was an hour ago
+        an_hour_ago = timezone.now() - datetime.timedelta(hours=1)
+        cursor = an_hour_ago.isoformat().replace('+', '%2B')
+        Notification.objects.update(updated_at=an_hour_ago - datetime.timedelta(minutes=1))
+        hidden.is_active = False
+        hidden.save()
+        removed_id = removed.pk
+        removed.delete()
+        added = Notification.objects.create(title='added', message='.')
+        data = self.client.get(f'/api/notifications/active/?since={cursor}').json()
+        self.assertFalse(data['full'])
+        self.assertEqual([n['id'] for n in data['notifications']], [added.pk])
+        self.assertEqual(data['deleted'], sorted([hidden.pk, removed_id]))
+        data = self.client.get(f'/api/notifications/all/?since={kept.pk}').json()
+        self.assertEqual({n['id'] for n in data['notifications']}, {hidden.pk, added.pk})
+        self.assertEqual(data['deleted'], [removed_id])
+
+    def test_bad_cursor(self):
+        self.assertEqual(self.client.get('/api/notifications/all/?since=yesterday').status_code, 400)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+class ConcurrentPartsTests(TransactionTestCase):
+    """Concurrent parts (api.concurrency) run on other threads, so the rows must be committed."""
+
+    def test_same_output(self):
+        Achievements.objects.create(achievement='First light', link='https://example.com/')
+        Alumni.objects.create(name='Alum', email='alum@example.com')
+        Notification.objects.create(title='Notice', message='Hello')
+        for path in ('/api/homepage/', '/api/batch/?r=homepage,alumni,notifications.all'):
+            with override_settings(API_CONCURRENT_PARTS=True):
+                response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), self.client.get(path).json())
+
+
+class SnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alum = Alumni.objects.create(name='Alum', email='alum@example.com')
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        settings_override = override_settings(API_SNAPSHOT_DIR=self.directory, API_SNAPSHOT_BASE_URL='http://testserver')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            return f.read()
+
+    def manifest(self):
+        return json.loads(self.read('manifest.json'))
+
+    def test_publish(self):
+        self.assertEqual(publish(['/api/alumni/']), ['/api/alumni/'])
+        manifest = self.manifest()
+        self.assertIn('/api/events/astrax/', manifest) # Every endpoint is listed, published or not
+        versioned = manifest['/api/alumni/']
+        self.assertRegex(versioned, r'^alumni\.[0-9a-f]{12}\.json$')
+
+        body = self.read('alumni.json')
+        self.assertEqual(json.loads(body), self.client.get('/api/alumni/').json())
+        self.assertEqual(self.read(versioned), body)
+        self.assertEqual(gzip.decompress(self.read(versioned + '.gz')), body)
+        self.assertEqual(publish(['/api/alumni/']), []) # Unchanged: nothing rewritten
+
+        self.alum.name = 'Renamed'
+        self.alum.save()
+        self.assertEqual(publish(['/api/alumni/']), ['/api/alumni/'])
+        self.assertNotEqual(self.manifest()['/api/alumni/'], versioned)
+        self.assertEqual(json.loads(self.read('alumni.json'))[0]['name'], 'Renamed')
+        self.assertTrue(os.path.exists(os.path.join(self.directory, versioned))) # Kept for readers still fetching it
+
+    def test_old_versions_pruned(self):
+        for i in range(KEEP_VERSIONS + 2):
+            self.alum.name = f'Alum {i}'
+            self.alum.save()
+            publish(['/api/alumni/'])
+        versioned = sorted(name for name in os.listdir(self.directory) if re.fullmatch(r'alumni\.\w+\.json', name))
+        self.assertEqual(len(versioned), KEEP_VERSIONS)
+        self.assertIn(self.manifest()['/api/alumni/'], versioned)
+        siblings = [name for name in os.listdir(self.directory) if name.startswith('alumni.') and name.endswith('.gz')]
+        self.assertEqual(len(siblings), KEEP_VERSIONS + 1) # With alumni.json.gz
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        flagged = {name: warnings for name, sql, plan, warnings in explain_all() if warnings}
+        self.assertEqual(flagged, {})
+
+
+class GroupedRosterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name, position in (('Mentor', 'D'), ('Lead', 'A'), ('Member', 'C'), ('Lead 2', 'A')):
+            MemberDetail.objects.create(name=name, email='m@example.com', message='.', position=position)
+
+    def test_grouped_in_one_query(self):
+        with self.assertNumQueries(1):
+            groups = MemberDetail.objects.grouped_by_position()
+        self.assertEqual(list(groups), ['A', 'B', 'C', 'D'])
+        self.assertEqual([m.name for m in groups['A']], ['Lead', 'Lead 2'])
+
+    def test_api(self):
+        with self.assertNumQueries(2): # Versions for the ETag, then the roster
+            data = self.client.get('/api/coreteam/?grouped=1&fields=name').json()
+        self.assertEqual([group['position_display'] for group in data], ['Coordinator', 'Co-coordinator', 'Core Team', 'Mentor'])
+        self.assertEqual(data[0]['members'], [{'name': 'Lead'}, {'name': 'Lead 2'}])
+        self.assertEqual(data[1]['members'], [])
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Astrax.objects.create(name='Nebula night', description='<p>Watching the Orion <b>nebula</b> &amp; friends</p>')
+        Astrax.objects.create(name='Star party', description='<p>Telescopes out; a nebula if the sky is clear</p>')
+        PhotoGallery.objects.create(name='Moon', description='<p>Full moon</p>')
+        Notification.objects.create(title='Nebula workshop', message='Bring a laptop', is_active=False)
+
+    def test_plain_text(self):
+        self.assertEqual(plain_text('<p>One</p><p>two &amp; three</p>'), 'One two & three')
+
+    def test_ranked_and_highlighted(self):
+        results = search('nebul')
+        self.assertEqual([r['title'] for r in results], ['<mark>Nebula</mark> night', 'Star party']) # Title matches first
+        self.assertIn('Orion <mark>nebula</mark> &amp; friends', results[0]['snippet'])
+        self.assertEqual(search('moon', kinds=['astrax']), [])
+
+    def test_signals_keep_index_current(self):
+        notice = Notification.objects.get()
+        self.assertEqual(search('workshop'), []) # Inactive notifications aren't searchable
+        notice.is_active = True
+        notice.save()
+        self.assertEqual([(r['type'], r['id']) for r in search('workshop')], [('notification', notice.pk)])
+        moon = PhotoGallery.objects.get()
+        moon.name = 'Crescent'
+        moon.save()
+        self.assertEqual(search('moon')[0]['title'], 'Crescent')
+        moon.delete()
+        self.assertEqual(search('crescent'), [])
+
+    def test_api(self):
+        response = self.client.get('/api/search/?q=nebula&type=astrax&limit=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['id'] for r in response.json()['results']], [Astrax.objects.get(name='Nebula night').pk])
+        self.assertEqual(self.client.get('/api/search/').status_code, 400)
+
+
+class SearchFlushTests(TransactionTestCase):
+    def test_flush_empties_index(self):
+        Astrax.objects.create(name='Nebula night')
+        call_command('flush', interactive=False, verbosity=0) # What TransactionTestCase does between tests
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {FTS_TABLE}')
+            self.assertEqual(cursor.fetchone(), (0,))
+        Astrax.objects.create(name='Star party') # Reuses the flushed rowid
+        self.assertEqual([r['title'] for r in search('star')], ['<mark>Star</mark> party'])
+
+
+class RequestTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Alumni.objects.create(name='Alum', email='alum@example.com')
+
+    def setUp(self):
+        reset_stats()
+
+    def test_server_timing_and_route_stats(self):
+        for _ in range(3):
+            response = self.client.get('/api/alumni/')
+        parts = dict(part.split(';', 1) for part in response['Server-Timing'].split(', '))
+        self.assertEqual(list(parts), ['db', 'serialize', 'app', 'total'])
+        self.assertIn('desc="2 queries"', parts['db']) # Versions for the ETag, then the list
+        stats = route_stats()['api/alumni/']
+        self.assertEqual((stats['requests'], stats['queries_avg']), (3, 2))
+
+    @override_settings(CORS_ALLOWED_ORIGINS=['http://localhost:3000'])
+    def test_timing_allow_origin(self):
+        response = self.client.get('/api/alumni/', headers={'Origin': 'http://localhost:3000'})
+        self.assertEqual(response['Timing-Allow-Origin'], 'http://localhost:3000')
+        self.assertTrue(has_vary_header(response, 'Origin'))
+        response = self.client.get('/api/alumni/', headers={'Origin': 'https://elsewhere.example'})
+        self.assertFalse(response.has_header('Timing-Allow-Origin'))
+        self.assertTrue(has_vary_header(response, 'Origin'))
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_request_logged_with_sql(self):
+        with self.assertLogs('api.timing', 'WARNING') as logs:
+            self.client.get('/api/alumni/')
+        self.assertIn('GET /api/alumni/ -> 200', logs.output[0])
+        self.assertIn('FROM "Alumni_alumni"', logs.output[0])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'compression-tests'}})
+class CompressionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(20):
+            Alumni.objects.create(name=f'Alum {i}', email=f'alum{i}@example.com')
+            Achievements.objects.create(achievement=f'Achievement {i}', link='https://example.com/')
+
+    def setUp(self):
+        cache.clear()
+
+    def compressed(self, url):
+        """Whether ``url`` came back gzipped, and whether the gzipped body was cached."""
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        key = f"compressed:gzip:{hashlib.sha1(self.client.get(url).content).hexdigest()}"
+        return response.get('Content-Encoding') == 'gzip', cache.get(key) is not None
+
+    def test_only_shareable_responses_cached(self):
+        self.assertEqual(self.compressed('/api/alumni/?fields=name'), (True, False)) # Query string: compressed fast, not kept
+        self.assertEqual(self.compressed('/api/alumni/'), (True, True))
+
+    def test_cached_homepage_compressed_once(self):
+        with mock.patch('api.compression.compress', wraps=compress) as spy:
+            for _ in range(3):
+                response = self.client.get('/api/homepage/', headers={'Accept-Encoding': 'gzip'})
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual([call.kwargs.get('best') for call in spy.call_args_list], [True])
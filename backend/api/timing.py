@@ -0,0 +1,262 @@
+# api/timing.py
+"""
+Per-request timings (RequestTimingMiddleware).
+
+Every request is timed in four parts, sent as a Server-Timing header that
+browser devtools show in the network panel:
+
+    Server-Timing: db;dur=4.1;desc="3 queries", serialize;dur=11.0, app;dur=2.3, total;dur=17.4
+
+* db: time in SQL, measured by a wrapper on every database connection.
+* serialize: time turning data into JSON (serializers' ``.data``,
+  api.fastpath's rows and encoding, the renderer), inside
+  ``timed('serialize')`` blocks, less the queries run inside them
+  (querysets are evaluated lazily while serializing).
+* app: the rest: middleware, routing, the view's own work.
+
+Parts of one request running concurrently (api.concurrency) add up their
+db and serialize time, which can then exceed the total.
+
+A request slower than SLOW_REQUEST_MS is logged as a warning, with its
+SQL. Each route (the URL pattern, e.g. 'api/events/astrax/') also keeps
+its last REQUEST_TIMING_WINDOW timings, which ``route_stats()``
+summarizes and staff can read at /timings/.
+"""
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from STAC.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGGED_QUERIES = 50 # SQL kept per request for the slow request log
+
+_current = contextvars.ContextVar('request_timer', default=None)
+# Per thread: seconds of SQL run so far and the timed() blocks open, so a
+# block can leave out its own queries and nested blocks aren't counted twice
+_thread = threading.local()
+
+_routes = defaultdict(lambda: deque(maxlen=settings.REQUEST_TIMING_WINDOW))
+_routes_lock = threading.Lock()
+
+
+class RequestTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.queries = 0
+        self.sql = []
+        self.sections = defaultdict(float) # name -> seconds, 'db' included
+
+    def add_query(self, sql, seconds):
+        with self.lock:
+            self.queries += 1
+            self.sections['db'] += seconds
+            if len(self.sql) < MAX_LOGGED_QUERIES:
+                self.sql.append((seconds, sql))
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.sections[name] += seconds
+
+    def timings(self):
+        """``{part: milliseconds}`` as described in the module docstring."""
+        total = time.perf_counter() - self.started
+        parts = {name: seconds * 1000 for name, seconds in self.sections.items()}
+        parts.setdefault('db', 0.0)
+        parts['app'] = max(0.0, total * 1000 - sum(parts.values()))
+        parts['total'] = total * 1000
+        return parts
+
+
+def _thread_db_seconds():
+    return getattr(_thread, 'db_seconds', 0.0)
+
+
+def time_queries(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the current request's timer."""
+    timer = _current.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        seconds = time.perf_counter() - started
+        _thread.db_seconds = _thread_db_seconds() + seconds
+        timer.add_query(sql, seconds)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver: time every query the connection runs."""
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+@contextlib.contextmanager
+def timed(name):
+    """Add the time in the block, less its queries, to the current request's ``name`` part."""
+    timer = _current.get()
+    open_sections = getattr(_thread, 'sections', None)
+    if open_sections is None:
+        open_sections = _thread.sections = set()
+    if timer is None or name in open_sections:
+        yield
+        return
+    open_sections.add(name)
+    started, db_started = time.perf_counter(), _thread_db_seconds()
+    try:
+        yield
+    finally:
+        open_sections.discard(name)
+        elapsed = time.perf_counter() - started
+        timer.add(name, max(0.0, elapsed - (_thread_db_seconds() - db_started)))
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """DRF's JSONRenderer, counted as serialization."""
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('serialize'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class TimedListMixin:
+    """ListModelMixin.list() with the serializer's ``.data`` counted as serialization."""
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
+        with timed('serialize'):
+            data = serializer.data
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+def server_timing(timings, queries):
+    parts = []
+    for name, ms in timings.items():
+        desc = f';desc="{queries} queries"' if name == 'db' else ''
+        parts.append(f'{name};dur={ms:.1f}{desc}')
+    return ', '.join(parts)
+
+
+def _route(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.route if match is not None else None
+
+
+def record(route, timings, queries):
+    with _routes_lock:
+        _routes[route].append((timings['total'], timings['db'], timings.get('serialize', 0.0), queries))
+
+
+def route_stats():
+    """``{route: summary}`` of the timings kept for each route, in milliseconds, slowest p95 first."""
+    with _routes_lock:
+        samples = {route: list(window) for route, window in _routes.items()}
+    stats = {}
+    for route, window in samples.items():
+        totals = [sample[0] for sample in window]
+        stats[route] = {
+            'requests': len(window),
+            'p50': round(percentile(totals, 50), 1),
+            'p95': round(percentile(totals, 95), 1),
+            'p99': round(percentile(totals, 99), 1),
+            'max': round(max(totals), 1),
+            'db_avg': round(sum(sample[1] for sample in window) / len(window), 1),
+            'serialize_avg': round(sum(sample[2] for sample in window) / len(window), 1),
+            'queries_avg': round(sum(sample[3] for sample in window) / len(window), 1),
+        }
+    return dict(sorted(stats.items(), key=lambda item: -item[1]['p95']))
+
+
+def reset_stats():
+    with _routes_lock:
+        _routes.clear()
+
+
+@staff_member_required
+def timings_view(request):
+    """The per-route timings of this process, as JSON."""
+    return JsonResponse({'window': settings.REQUEST_TIMING_WINDOW, 'routes': route_stats()})
+
+
+class RequestTimingMiddleware:
+    """
+    Times requests as described in the module docstring. Goes first in
+    MIDDLEWARE, so the total covers the other middleware too.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.REQUEST_TIMING:
+            return self.get_response(request)
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timer)
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_TIMING:
+            return await self.get_response(request)
+        timer = RequestTimer()
+        # Work handed to threads (sync_to_async, api.concurrency) copies the context, and the timer with it
+        token = _current.set(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timer)
+
+    def finish(self, request, response, timer):
+        timings = timer.timings()
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = server_timing(timings, timer.queries)
+            origin = request.headers.get('Origin')
+            if origin and origin in settings.CORS_ALLOWED_ORIGINS:
+                # Lets the frontend's devtools and PerformanceResourceTiming read the header
+                response['Timing-Allow-Origin'] = origin
+            if settings.CORS_ALLOWED_ORIGINS:
+                # The header depends on the Origin, so shared caches must key on it
+                patch_vary_headers(response, ['Origin'])
+        route = _route(request)
+        if route is not None:
+            record(route, timings, timer.queries)
+        if timings['total'] >= settings.SLOW_REQUEST_MS:
+            self.log_slow(request, response, timings, timer)
+        return response
+
+    def log_slow(self, request, response, timings, timer):
+        queries = '\n'.join(f'  {seconds * 1000:7.1f} ms  {sql}' for seconds, sql in timer.sql)
+        if timer.queries > len(timer.sql):
+            queries += f'\n  ... {timer.queries - len(timer.sql)} more'
+        logger.warning(
+            "Slow request: %s %s -> %s in %.0f ms (%s)\n%s",
+            request.method, request.get_full_path(), response.status_code, timings['total'],
+            server_timing(timings, timer.queries), queries or '  (no queries)',
+        )
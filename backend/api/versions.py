@@ -0,0 +1,54 @@
+# api/versions.py
+"""
+Per-model change tracking for conditional GETs (see api.mixins).
+
+Apps call ``track()`` for their models in AppConfig.ready(). Every save
+or delete, and every image swap by the image worker, then bumps the
+model's ModelVersion row in the same transaction. Writes that skip signals
+(bulk_create, queryset update()) must call ``bump()`` themselves.
+
+Each bump also sends ``model_changed`` (sender: the model class), for
+things derived from the data, like JSON snapshots (see api.snapshots).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+
+from imaging.signals import image_processed
+
+from .models import ModelVersion
+
+model_changed = Signal()
+
+
+def _bump_sender(sender, **kwargs):
+    bump(sender)
+
+
+def track(*models):
+    for model in models:
+        uid = f'api_version_{model._meta.label}'
+        post_save.connect(_bump_sender, sender=model, dispatch_uid=uid)
+        post_delete.connect(_bump_sender, sender=model, dispatch_uid=uid)
+        image_processed.connect(_bump_sender, sender=model, dispatch_uid=uid)
+
+
+def bump(*models):
+    for model in models:
+        ModelVersion.objects.bump(model)
+        model_changed.send(sender=model)
+
+
+def get_versions(models):
+    """
+    ``(versions, last_modified)`` for ``models`` in one query: their
+    version numbers in order (0 = unchanged since tracking began) and the
+    latest change time, or None if none has changed yet.
+    """
+    labels = [model._meta.label for model in models]
+    rows = {
+        label: (version, modified)
+        for label, version, modified in ModelVersion.objects.filter(label__in=labels).values_list('label', 'version', 'modified')
+    }
+    versions = [rows.get(label, (0, None))[0] for label in labels]
+    modified = [rows[label][1] for label in labels if label in rows]
+    return versions, max(modified, default=None)
@@ -0,0 +1,95 @@
+# api/views.py
+import functools
+import io
+import json
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import resolve
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .concurrency import AggregateMixin
+from .mixins import ConditionalListMixin
+from .routes import api_views, resource_name, view_models
+
+# Request headers that would make a part answer 304 instead of returning its data
+CONDITIONAL_HEADERS = ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE')
+
+
+def _subrequest(request, path):
+    """A GET for ``path`` with the same host, scheme and headers as ``request``."""
+    environ = {key: value for key, value in request.META.items() if key not in CONDITIONAL_HEADERS}
+    environ.update({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'wsgi.url_scheme': request.scheme, # Missing from META under ASGI
+        'wsgi.input': io.BytesIO(),
+    })
+    return WSGIRequest(environ)
+
+
+class BatchAPIView(AggregateMixin, APIView):
+    """
+    /api/batch/?r=homepage,events.astrax,notifications.active
+    Several API endpoints in one round trip. Resources are named after their
+    path under /api/ with dots for slashes. Each is produced by its own view,
+    so the output is identical to fetching it directly:
+
+        {"homepage": {"status": 200, "data": {...}},
+         "events.nope": {"status": 404, "error": "Unknown resource"}}
+
+    One failing part doesn't fail the others.
+    """
+    def get_resources(self):
+        """``{name: path}`` of the requested resources, in request order."""
+        available = {resource_name(path): path for path in api_views()}
+        names = [name.strip() for name in self.request.query_params.get('r', '').split(',') if name.strip()]
+        return {name: available.get(name) for name in dict.fromkeys(names)}
+
+    def fetch_part(self, path):
+        """The ``{status, data}`` or ``{status, error}`` entry for the resource at ``path``."""
+        if path is None or path == self.request.path:
+            return {"status": 404, "error": "Unknown resource"}
+        try:
+            match = resolve(path)
+            response = match.func(_subrequest(self.request._request, path), *match.args, **match.kwargs)
+        except Exception as e:
+            return {"status": 500, "error": str(e)}
+        if hasattr(response, 'data'):
+            data = response.data
+        else: # Already encoded, e.g. by api.fastpath
+            data = json.loads(response.content) if response.get('Content-Type', '').startswith('application/json') else None
+        if response.status_code == 200:
+            return {"status": 200, "data": data}
+        error = (data.get('error') or data.get('detail')) if isinstance(data, dict) else None
+        return {"status": response.status_code, "error": str(error or response.reason_phrase)}
+
+    def get(self, request, *args, **kwargs):
+        resources = self.get_resources()
+        if not resources:
+            return Response({"error": "Name the resources to fetch with ?r=a,b,c"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(resources) > settings.API_BATCH_MAX_RESOURCES:
+            return Response(
+                {"error": f"At most {settings.API_BATCH_MAX_RESOURCES} resources per batch"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Parts are independent, so they can be fetched concurrently (see api.concurrency)
+        results = self.run_parts({
+            name: functools.partial(self.fetch_part, path) for name, path in resources.items()
+        })
+        return Response(results, status=status.HTTP_200_OK)
+
+
+class BatchView(ConditionalListMixin, BatchAPIView):
+    """The batch endpoint, answering conditional GETs from the versions of every model its parts use."""
+    def get_version_models(self):
+        views = api_views()
+        models = []
+        for path in self.get_resources().values():
+            if path in views:
+                models.extend(model for model in view_models(views[path]) if model not in models)
+        return models
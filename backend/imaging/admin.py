@@ -0,0 +1,20 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import ImageJob
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ('source_name', 'content_type', 'object_id', 'status', 'attempts', 'updated_at')
+    list_filter = ('status', 'content_type')
+    search_fields = ('source_name', 'last_error')
+    readonly_fields = ('content_type', 'object_id', 'source_name', 'attempts', 'last_error', 'created_at', 'updated_at')
+    actions = ['retry_jobs']
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        count = queryset.exclude(status=ImageJob.RUNNING).update(
+            status=ImageJob.PENDING, attempts=0, available_at=timezone.now()
+        )
+        self.message_user(request, f"{count} job(s) queued again.")
@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+
+
+class ImagingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'imaging'
+
+    def ready(self):
+        from django.conf import settings
+        from PIL import Image
+
+        from .signals import connect_signals
+
+        # Pillow warns about images over this and refuses those over twice
+        # it as soon as the header is read (so ImageField validation rejects
+        # them at upload time); open_bounded() rejects anything over it.
+        Image.MAX_IMAGE_PIXELS = settings.IMAGE_MAX_SOURCE_PIXELS
+        connect_signals()
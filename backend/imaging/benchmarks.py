@@ -0,0 +1,133 @@
+# imaging/benchmarks.py
+"""
+Micro-benchmarks for the shared image pipeline (imaging.processing.process_image),
+run with ``python manage.py bench_images``.
+
+Inputs are generated deterministically, so runs on the same machine are
+comparable. Each (input, setting) case runs in a fresh process so its peak
+RSS can be reported on its own.
+"""
+import os
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import PIL
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from PIL import Image
+
+from STAC.stats import percentile
+
+from .processing import process_image
+from .worker import init_pool_process
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+# (label, format, size). PNGs stay smaller: large photos are never PNG in practice.
+CORPUS = [
+    ('phone-small', 'JPEG', (800, 600)),
+    ('web-medium', 'JPEG', (1920, 1280)),
+    ('camera-12mp', 'JPEG', (4000, 3000)),
+    ('dslr-24mp', 'JPEG', (6000, 4000)),
+    ('screenshot', 'PNG', (1280, 800)),
+    ('poster', 'PNG', (2480, 3508)),
+]
+
+
+def _synthetic_image(size):
+    """Structured detail, a smooth gradient and sensor-like noise, so encoders have real work to do."""
+    detail = Image.effect_mandelbrot(size, (-2.0, -1.2, 0.8, 1.2), 64)
+    gradient = Image.linear_gradient('L').resize(size)
+    noise = Image.effect_noise(size, 24)
+    return Image.merge('RGB', (detail, gradient, noise))
+
+
+def build_corpus(directory, corpus=CORPUS):
+    """Write the synthetic inputs to ``directory`` (reusing earlier ones). Returns [(label, filename)]."""
+    os.makedirs(directory, exist_ok=True)
+    inputs = []
+    for label, fmt, size in corpus:
+        filename = f"{label}-{size[0]}x{size[1]}.{'jpg' if fmt == 'JPEG' else 'png'}"
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            _synthetic_image(size).save(path, fmt, quality=92)
+        inputs.append((label, filename))
+    return inputs
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if platform.system() == 'Darwin' else peak * 1024 # macOS reports bytes, Linux KiB
+
+
+def _run_case(directory, filename, quality, method, repeat):
+    """Runs in a fresh process: time ``repeat`` conversions of one input."""
+    storage = FileSystemStorage(location=directory)
+    baseline = _peak_rss_bytes()
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        display_name, meta = process_image(storage, filename, quality=quality, method=method)
+        latencies.append(time.perf_counter() - started)
+
+    peak = _peak_rss_bytes()
+    with Image.open(storage.path(filename)) as source:
+        source_size = [*source.size]
+    return {
+        'latencies_ms': [round(t * 1000, 2) for t in latencies],
+        'peak_rss_delta_bytes': None if peak is None else peak - baseline,
+        'display_bytes': meta['bytes'],
+        'output_bytes': sum(
+            entry['bytes'] + sum(v['bytes'] for v in entry['variants'].values())
+            for entry in [meta, *meta['srcset']]
+        ),
+        'source_bytes': os.path.getsize(storage.path(filename)),
+        'source_size': source_size,
+    }
+
+
+def run_benchmarks(directory, qualities, methods, repeat, corpus=CORPUS, progress=None):
+    """Run every input at every quality/method combination. Returns a JSON-serializable report."""
+    inputs = build_corpus(os.path.join(directory, 'inputs'), corpus)
+    results = []
+    for quality in qualities:
+        for method in methods:
+            for label, filename in inputs:
+                with ProcessPoolExecutor(max_workers=1, initializer=init_pool_process) as pool:
+                    case = pool.submit(
+                        _run_case, os.path.join(directory, 'inputs'), filename, quality, method, repeat
+                    ).result()
+                latencies = case.pop('latencies_ms')
+                case.update({
+                    'input': label,
+                    'quality': quality,
+                    'method': method,
+                    'p50_ms': percentile(latencies, 50),
+                    'p90_ms': percentile(latencies, 90),
+                    'p99_ms': percentile(latencies, 99),
+                    'max_ms': max(latencies),
+                    'samples_ms': latencies,
+                })
+                results.append(case)
+                if progress is not None:
+                    progress(case)
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'derivative_widths': settings.IMAGE_DERIVATIVE_WIDTHS,
+            'decode_pixel_budget': settings.IMAGE_DECODE_PIXEL_BUDGET,
+        },
+        'repeat': repeat,
+        'results': results,
+    }
@@ -0,0 +1,79 @@
+# imaging/gc.py
+"""
+Finds files under MEDIA_ROOT that no record refers to. Used by
+``python manage.py gc_media``.
+"""
+import os
+import time
+
+from django.apps import apps
+from django.db import models
+
+from .models import ProcessedImageModel, StoredImage
+from .processing import image_files
+
+
+def referenced_files():
+    """
+    Storage names of every file still in use: the value of each FileField
+    /ImageField in every installed app, plus, for processed images, the
+    original and all derivatives listed in image_meta and StoredImage.
+    Field defaults (default.jpg etc.) are always kept.
+    """
+    names = set()
+    for model in apps.get_models():
+        fields = [f for f in model._meta.concrete_fields if isinstance(f, models.FileField)]
+        if not fields:
+            continue
+        names.update(str(f.get_default()) for f in fields if f.has_default())
+
+        columns = [f.attname for f in fields]
+        processed = issubclass(model, ProcessedImageModel)
+        if processed:
+            columns.append('image_meta')
+        rows = model._default_manager.values_list(*columns).iterator(chunk_size=2000)
+        for row in rows:
+            if processed:
+                *row, meta = row
+                names.update(image_files(row[columns.index('image')], meta))
+            names.update(name for name in row if name)
+
+    for name, meta in StoredImage.objects.values_list('name', 'meta').iterator(chunk_size=2000):
+        names.update(image_files(name, meta))
+    names.discard('')
+    return names
+
+
+def walk_files(root):
+    """
+    Yield ``(name, path, stat)`` for every file under ``root``, with
+    ``name`` relative to it using '/' like storage names. Streams one
+    directory at a time, so huge media trees are never listed in full.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    name = os.path.relpath(entry.path, root).replace(os.sep, '/')
+                    yield name, entry.path, entry.stat(follow_symlinks=False)
+
+
+def find_orphans(root, min_age=3600, exclude=()):
+    """
+    Yield ``(name, path, size)`` for unreferenced files under ``root``.
+    Files modified within ``min_age`` seconds are skipped: an upload is
+    written before its record is committed, and the image worker writes
+    derivatives before pointing the record at them.
+    """
+    referenced = referenced_files()
+    cutoff = time.time() - min_age
+    for name, path, stat in walk_files(root):
+        if name in referenced or stat.st_mtime > cutoff:
+            continue
+        if any(name.startswith(prefix) for prefix in exclude):
+            continue
+        yield name, path, stat.st_size
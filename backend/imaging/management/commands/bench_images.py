@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from imaging.benchmarks import run_benchmarks
+from imaging.processing import WEBP_METHOD, WEBP_QUALITY
+
+
+def _int_list(value):
+    return [int(v) for v in value.split(',')]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the image pipeline the models use (resize + WebP derivatives) on a fixed "
+        "synthetic corpus. Reports latency percentiles, peak memory and output size per input "
+        "and quality/method setting."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help="Conversions per input and setting (default: 5).")
+        parser.add_argument('--quality', type=_int_list, default=[WEBP_QUALITY], help="Comma-separated WebP qualities, e.g. 75,90.")
+        parser.add_argument('--method', type=_int_list, default=[WEBP_METHOD], help="Comma-separated WebP methods (0-6), e.g. 2,4,6.")
+        parser.add_argument('--workdir', help="Where to keep the generated corpus (default: a reused temp directory).")
+        parser.add_argument('--json', dest='json_path', help="Also write the full report as JSON to this file ('-' for stdout only).")
+
+    def handle(self, *args, **options):
+        workdir = options['workdir'] or os.path.join(tempfile.gettempdir(), 'stac-bench-images')
+        json_only = options['json_path'] == '-'
+        if not json_only:
+            self.stdout.write(f"{'input':<14}{'q':>4}{'m':>3}{'p50 ms':>10}{'p90 ms':>10}{'max ms':>10}{'peak MB':>10}{'out KB':>10}")
+
+        def progress(case):
+            if json_only:
+                return
+            peak = case['peak_rss_delta_bytes']
+            self.stdout.write(
+                f"{case['input']:<14}{case['quality']:>4}{case['method']:>3}"
+                f"{case['p50_ms']:>10.1f}{case['p90_ms']:>10.1f}{case['max_ms']:>10.1f}"
+                f"{'n/a' if peak is None else f'{peak / 2**20:.1f}':>10}{case['output_bytes'] / 1024:>10.1f}"
+            )
+
+        report = run_benchmarks(workdir, options['quality'], options['method'], options['repeat'], progress=progress)
+
+        if json_only:
+            self.stdout.write(json.dumps(report, indent=2))
+        elif options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['json_path']}"))
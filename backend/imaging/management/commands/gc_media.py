@@ -0,0 +1,66 @@
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from imaging.gc import find_orphans
+
+
+class Command(BaseCommand):
+    help = (
+        "Report files under MEDIA_ROOT that no FileField/ImageField refers to "
+        "(dry run by default), or delete them with --delete."
+    )
+
+    def add_arguments(self, parser):
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument('--dry-run', action='store_true', help="Only report the unreferenced files (the default).")
+        mode.add_argument('--delete', action='store_true', help="Delete the unreferenced files instead of only reporting them.")
+        parser.add_argument('--min-age', type=int, default=3600, help="Ignore files modified less than this many seconds ago (default: 3600).")
+        parser.add_argument('--exclude', action='append', default=[], help="Storage name prefix to leave alone, e.g. 'uploads/'. Repeatable.")
+
+    def handle(self, *args, **options):
+        root = settings.MEDIA_ROOT
+        if not os.path.isdir(root):
+            self.stdout.write(f"{root} does not exist, nothing to do.")
+            return
+
+        delete = options['delete']
+        totals = defaultdict(lambda: [0, 0]) # top-level directory -> [files, bytes]
+        touched_dirs = set()
+        failed = 0
+        for name, path, size in find_orphans(root, options['min_age'], options['exclude']):
+            if delete:
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    failed += 1
+                    self.stderr.write(f"Could not delete {name}: {e}")
+                    continue
+                touched_dirs.add(os.path.dirname(path))
+            if options['verbosity'] > 1:
+                self.stdout.write(f"{'deleted' if delete else 'unreferenced'}  {size:>12}  {name}")
+            top = name.split('/', 1)[0] if '/' in name else '.'
+            totals[top][0] += 1
+            totals[top][1] += size
+
+        # Drop directories the deletions left empty
+        for directory in sorted(touched_dirs, key=len, reverse=True):
+            while directory != os.path.normpath(root):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+
+        count = sum(files for files, _ in totals.values())
+        size = sum(size for _, size in totals.values())
+        for top, (files, top_size) in sorted(totals.items()):
+            self.stdout.write(f"  {top + '/':<30}{files:>8} file(s){top_size / 1e6:>12.1f} MB")
+        verb = 'Deleted' if delete else 'Found'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {count} unreferenced file(s), {size / 1e6:.1f} MB."))
+        if not delete and count:
+            self.stdout.write("Run again with --delete to remove them.")
+        if failed:
+            self.stderr.write(f"{failed} file(s) could not be deleted.")
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from imaging.worker import run_worker
+
+
+class Command(BaseCommand):
+    help = "Process queued image jobs (resizing and WebP conversion of uploads)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Exit when the queue is empty instead of polling.")
+        parser.add_argument('--poll-interval', type=float, help="Seconds to sleep when the queue is empty.")
+
+    def handle(self, *args, **options):
+        try:
+            processed = run_worker(once=options['once'], poll_interval=options['poll_interval'], stdout=self.stdout)
+        except KeyboardInterrupt:
+            return
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} image job(s)."))
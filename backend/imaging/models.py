@@ -0,0 +1,211 @@
+# imaging/models.py
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.utils import timezone
+
+from .processing import image_files
+from .storage import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class ImageJobQuerySet(models.QuerySet):
+    def enqueue(self, instance):
+        """Queue processing of ``instance``'s current image."""
+        return self.create(
+            content_type=ContentType.objects.get_for_model(instance),
+            object_id=instance.pk,
+            source_name=instance.image.name,
+            max_attempts=settings.IMAGE_JOB_MAX_ATTEMPTS,
+        )
+
+    def claim_next(self):
+        """
+        Atomically move the oldest runnable job to RUNNING and return it.
+        The conditional UPDATE makes this safe with several workers, even on
+        SQLite which has no SELECT ... FOR UPDATE.
+        """
+        while True:
+            job = (
+                self.filter(status=ImageJob.PENDING, available_at__lte=timezone.now())
+                .order_by('available_at', 'pk')
+                .first()
+            )
+            if job is None:
+                return None
+            claimed = self.filter(pk=job.pk, status=ImageJob.PENDING).update(
+                status=ImageJob.RUNNING,
+                attempts=models.F('attempts') + 1,
+                updated_at=timezone.now(),
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+
+    def requeue_stale(self, timeout):
+        """Hand jobs left RUNNING by a crashed worker back to the queue."""
+        cutoff = timezone.now() - timedelta(seconds=timeout)
+        return self.filter(status=ImageJob.RUNNING, updated_at__lt=cutoff).update(
+            status=ImageJob.PENDING,
+            updated_at=timezone.now(),
+        )
+
+
+class ImageJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    STATUSES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+        (CANCELLED, 'Cancelled'),
+    )
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    target = GenericForeignKey('content_type', 'object_id')
+    source_name = models.CharField(max_length=255) # Image name the job was queued for
+
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    available_at = models.DateTimeField(default=timezone.now) # Pushed back between retries
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ImageJobQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='imagejob_runnable_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type.model} #{self.object_id}: {self.source_name} ({self.status})"
+
+    def mark_done(self, status=DONE):
+        self.status = status
+        self.last_error = ''
+        self.save(update_fields=['status', 'last_error', 'updated_at'])
+
+    def mark_failed(self, error, retry=True):
+        """Record ``error``; reschedule with exponential backoff while attempts remain."""
+        self.last_error = str(error)
+        if retry and self.attempts < self.max_attempts:
+            self.status = self.PENDING
+            delay = settings.IMAGE_JOB_RETRY_DELAY * (2 ** (self.attempts - 1))
+            self.available_at = timezone.now() + timedelta(seconds=delay)
+        else:
+            self.status = self.FAILED
+        self.save(update_fields=['status', 'last_error', 'available_at', 'updated_at'])
+
+
+def _delete_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError as e:
+            logger.warning("Error deleting image file %s: %s", name, e)
+
+
+class StoredImageQuerySet(models.QuerySet):
+    def acquire(self, name, count=1):
+        """Count ``count`` more records using the content-addressed original ``name``."""
+        sha = content_hash(name)
+        if sha is None:
+            return
+        blob, _ = self.get_or_create(sha256=sha, defaults={'name': name})
+        self.filter(pk=blob.pk).update(refcount=models.F('refcount') + count)
+
+    def release(self, storage, name, meta, keep=()):
+        """
+        Drop a record's reference to the image stored as ``name`` (with
+        ``meta`` from its image_meta). The files are deleted, after commit,
+        once no record uses them; names in ``keep`` are never deleted.
+        Images uploaded before content-addressed storage are owned by a
+        single record and are deleted straight away.
+        """
+        names = image_files(name, meta)
+        sha = content_hash(meta.get('original') or name)
+        if sha is not None:
+            self.filter(sha256=sha, refcount__gt=0).update(refcount=models.F('refcount') - 1)
+            blob = self.filter(sha256=sha, refcount=0).first()
+            if blob is None:
+                return
+            names |= image_files(blob.name, blob.meta)
+            blob.delete()
+
+        names -= {n for n in keep if n}
+        if names:
+            transaction.on_commit(lambda: _delete_files(storage, names))
+
+
+class StoredImage(models.Model):
+    """
+    One content-addressed original (see imaging.storage) and the derivatives
+    the image worker built for it, shared by every record that uploaded the
+    same bytes. ``meta`` is reused so identical uploads are encoded once.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255)
+    refcount = models.PositiveIntegerField(default=0)
+    meta = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = StoredImageQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount} references)"
+
+
+class ProcessedImageModel(models.Model):
+    """
+    Base for models with an ``image`` field that should be resized and
+    WebP-encoded. save() only stores the upload and queues an ImageJob; the
+    image worker later swaps ``image`` over to the processed file and records
+    the result in ``image_meta``. Until then the original is served.
+    """
+    image_meta = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        previous = None
+        if self.pk is not None:
+            previous = type(self)._default_manager.filter(pk=self.pk).values_list('image', 'image_meta').first()
+        image_changed = previous is None or previous[0] != self.image.name
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'image' not in update_fields:
+            image_changed = False
+        if image_changed:
+            self.image_meta = {}
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'image_meta'}
+
+        super().save(*args, **kwargs)
+
+        if not image_changed:
+            return
+        StoredImage.objects.acquire(self.image.name)
+        if previous is not None:
+            self.release_image(*previous, keep={self.image.name})
+        if self.image and self.image.name != self._meta.get_field('image').get_default():
+            ImageJob.objects.enqueue(self)
+
+    def release_image(self, name, meta, keep=()):
+        """Give up this record's claim on the image files ``name``/``meta``."""
+        field = self._meta.get_field('image')
+        StoredImage.objects.release(field.storage, name, meta, keep={field.get_default(), *keep})
@@ -0,0 +1,67 @@
+# imaging/negotiation.py
+"""
+Picks an image format from the request's Accept header.
+
+Only formats a client names explicitly count: browsers send "*/*" or
+"image/*" whether or not they can decode AVIF or WebP, so a wildcard
+only ever gets the JPEG fallback.
+"""
+import os
+
+from django.core.exceptions import SuspiciousFileOperation
+
+from .processing import FORMATS, extra_formats
+
+
+def accepted_image_types(accept):
+    """Image media types listed in ``accept`` with a non-zero q value."""
+    types = set()
+    for part in accept.split(','):
+        media_type, *params = (p.strip() for p in part.split(';'))
+        q = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0 and media_type.startswith('image/'):
+            types.add(media_type.lower())
+    return types
+
+
+def _acceptable(fmt, accepted):
+    return fmt == 'jpeg' or FORMATS[fmt][1] in accepted
+
+
+def preferred_format(accept):
+    """Format to generate for a client: AVIF, then WebP, then JPEG."""
+    accepted = accepted_image_types(accept)
+    for fmt in ('avif', 'webp'):
+        if (fmt == 'webp' or fmt in extra_formats()) and _acceptable(fmt, accepted):
+            return fmt
+    return 'jpeg'
+
+
+def choose_variant(storage, name, accept):
+    """
+    For a WebP derivative ``name``, the smallest stored sibling
+    (.avif/.webp/.jpg) the client accepts, as ``(name, content_type)``.
+    Falls back to ``name`` itself when nothing else fits.
+    """
+    accepted = accepted_image_types(accept)
+    base, _ = os.path.splitext(name)
+    best = None
+    for fmt, (ext, content_type) in FORMATS.items():
+        if not _acceptable(fmt, accepted):
+            continue
+        candidate = f"{base}.{ext}"
+        try:
+            size = os.path.getsize(storage.path(candidate))
+        except (OSError, SuspiciousFileOperation):
+            continue
+        if best is None or size < best[0]:
+            best = (size, candidate, content_type)
+    if best is None:
+        return name, FORMATS['webp'][1]
+    return best[1], best[2]
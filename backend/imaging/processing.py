@@ -0,0 +1,223 @@
+# imaging/processing.py
+"""
+The thumbnail-and-WebP conversion shared by every image-bearing model.
+
+This used to be copy-pasted into each model's save() method. It now runs in
+the image worker (see imaging.worker) so uploads don't block a request.
+
+WebP is the primary format the API links to. Each WebP can also get AVIF
+and JPEG siblings (IMAGE_EXTRA_FORMATS) with the same name and another
+extension; media serving picks between them by Accept header
+(see imaging.negotiation).
+"""
+import base64
+import functools
+import io
+import os
+
+from django.conf import settings
+from PIL import Image, UnidentifiedImageError
+
+DISPLAY_SIZE = (720, 1080)
+WEBP_QUALITY = 90
+WEBP_METHOD = 4 # Pillow's default encoder effort (0 fast .. 6 smallest)
+AVIF_QUALITY = 60 # Roughly matches WebP 90 visually
+AVIF_SPEED = 6
+JPEG_QUALITY = 85
+UNBOUNDED = 1 << 16
+PLACEHOLDER_SIZE = (20, 20)
+PLACEHOLDER_QUALITY = 40
+
+
+class ImageRejected(ValueError):
+    """The image is too large to process within the configured limits."""
+
+
+# Errors for files that will never process: not an image, or too large. Pillow's
+# DecompressionBombWarning only raises where warnings are turned into errors.
+UNPROCESSABLE_ERRORS = (UnidentifiedImageError, ImageRejected, Image.DecompressionBombError, Image.DecompressionBombWarning)
+
+
+def derivative_name(source_name, label, ext='webp'):
+    """
+    Storage name of a processed copy of ``source_name``.
+    e.g. ('images/Astrax/poster.jpg', '720x1080') -> 'images/Astrax/poster.720x1080.webp'
+    """
+    base, _ = os.path.splitext(source_name)
+    return f"{base}.{label}.{ext}"
+
+
+# format -> (extension, content type)
+FORMATS = {
+    'webp': ('webp', 'image/webp'),
+    'avif': ('avif', 'image/avif'),
+    'jpeg': ('jpg', 'image/jpeg'),
+}
+
+
+@functools.cache
+def can_encode(fmt):
+    """Whether this Pillow build has an encoder for ``fmt``; AVIF needs Pillow 11.2+ built with libavif."""
+    Image.init()
+    return fmt.upper() in Image.SAVE
+
+
+def extra_formats():
+    """IMAGE_EXTRA_FORMATS that this Pillow build can encode."""
+    return [fmt for fmt in settings.IMAGE_EXTRA_FORMATS if can_encode(fmt)]
+
+
+def _encode(img, path, fmt, quality=None, method=WEBP_METHOD):
+    """Write ``img`` to ``path`` as ``fmt``; ``quality`` defaults per format."""
+    if fmt == 'webp':
+        img.save(path, 'webp', quality=quality or WEBP_QUALITY, method=method)
+    elif fmt == 'avif':
+        img.save(path, 'avif', quality=quality or AVIF_QUALITY, speed=AVIF_SPEED)
+    elif fmt == 'jpeg':
+        if img.mode == 'RGBA':
+            flat = Image.new('RGB', img.size, 'white')
+            flat.paste(img, mask=img.getchannel('A'))
+            img = flat
+        img.save(path, 'jpeg', quality=quality or JPEG_QUALITY, optimize=True, progressive=True)
+    else:
+        raise ValueError(f"Unsupported image format {fmt!r}")
+
+
+def _save_variants(img, storage, source_name, label, quality=WEBP_QUALITY, method=WEBP_METHOD):
+    """
+    Save ``img`` as the WebP derivative ``label`` of ``source_name`` plus its
+    extra-format siblings. Returns (webp name, webp bytes, {format: {name, bytes}}).
+    """
+    name = derivative_name(source_name, label)
+    path = storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _encode(img, path, 'webp', quality, method)
+
+    variants = {}
+    for fmt in extra_formats():
+        variant_name = derivative_name(source_name, label, FORMATS[fmt][0])
+        variant_path = storage.path(variant_name)
+        _encode(img, variant_path, fmt)
+        variants[fmt] = {'name': variant_name, 'bytes': os.path.getsize(variant_path)}
+    return name, os.path.getsize(path), variants
+
+
+def _prepare(img):
+    """Convert palette/CMYK/etc. images to a mode WebP can encode and resize properly."""
+    if img.mode in ('RGB', 'RGBA'):
+        return img
+    has_alpha = img.mode in ('LA', 'PA') or 'transparency' in img.info
+    return img.convert('RGBA' if has_alpha else 'RGB')
+
+
+def placeholder_data_uri(img):
+    """
+    A blurry ~20px WebP of ``img`` as a data: URI (a few hundred bytes), for
+    pages to show while the real image loads.
+    """
+    tiny = img.copy()
+    tiny.thumbnail(PLACEHOLDER_SIZE)
+    buf = io.BytesIO()
+    tiny.save(buf, 'webp', quality=PLACEHOLDER_QUALITY)
+    return 'data:image/webp;base64,' + base64.b64encode(buf.getvalue()).decode('ascii')
+
+
+def open_bounded(path, max_width, max_height=None):
+    """
+    Open the image at ``path`` for producing copies at most ``max_width``
+    wide (and ``max_height`` high), keeping decoding memory bounded:
+
+    * dimensions are checked from the header, before any pixel data is
+      allocated, and images over IMAGE_MAX_SOURCE_PIXELS are rejected;
+    * JPEGs are decoded straight at a reduced scale (1/2, 1/4 or 1/8) that
+      is still at least ``max_width`` wide, so a 50 MP DSLR photo never
+      exists in memory at full size;
+    * whatever must still be decoded is held to IMAGE_DECODE_PIXEL_BUDGET.
+    """
+    img = Image.open(path)
+    try:
+        if img.width * img.height > settings.IMAGE_MAX_SOURCE_PIXELS:
+            raise ImageRejected(
+                f"{img.width}x{img.height} exceeds the {settings.IMAGE_MAX_SOURCE_PIXELS} pixel limit"
+            )
+        target_width = min(img.width, max_width)
+        if max_height:
+            target_width = min(target_width, max(1, max_height * img.width // img.height))
+        img.draft(None, (target_width, max(1, img.height * target_width // img.width)))
+        if img.width * img.height > settings.IMAGE_DECODE_PIXEL_BUDGET:
+            raise ImageRejected(
+                f"decoding {img.format} at {img.width}x{img.height} exceeds the "
+                f"{settings.IMAGE_DECODE_PIXEL_BUDGET} pixel budget"
+            )
+        img.load()
+    except Exception:
+        img.close()
+        raise
+    return img
+
+
+def srcset_widths(source_width, widths=None):
+    """Configured derivative widths, capped at the source width (never upscale)."""
+    widths = widths or settings.IMAGE_DERIVATIVE_WIDTHS
+    return sorted({min(w, source_width) for w in widths}, reverse=True)
+
+
+def process_image(storage, source_name, quality=WEBP_QUALITY, method=WEBP_METHOD):
+    """
+    Build every derivative of the stored image ``source_name``: the 720x1080
+    display WebP the ``image`` field is switched to, plus one WebP per
+    configured width for srcset, encoded at ``quality``/``method``, their
+    AVIF/JPEG siblings, and a tiny inline placeholder.
+    Returns ``(display_name, meta)``.
+
+    The source is decoded once, at reduced scale where possible (see
+    open_bounded); each width is resized from the previous, larger one,
+    which is much cheaper than going back to the original.
+    """
+    max_width = max(*settings.IMAGE_DERIVATIVE_WIDTHS, DISPLAY_SIZE[0])
+    with open_bounded(storage.path(source_name), max_width) as img:
+        img = _prepare(img)
+        meta = {'original': source_name, 'srcset': []}
+
+        current = img
+        for width in srcset_widths(img.width):
+            height = max(1, round(current.height * width / current.width))
+            if width != current.width:
+                current = current.resize((width, height), Image.LANCZOS)
+            name, size, variants = _save_variants(current, storage, source_name, f'{width}w', quality, method)
+            meta['srcset'].append({'name': name, 'width': width, 'height': height, 'bytes': size, 'variants': variants})
+        meta['srcset'].reverse() # Smallest first, like an HTML srcset
+        meta['placeholder'] = placeholder_data_uri(current)
+
+        display = img.copy()
+        display.thumbnail(DISPLAY_SIZE)
+        display_name, meta['bytes'], meta['variants'] = _save_variants(
+            display, storage, source_name, '%dx%d' % DISPLAY_SIZE, quality, method
+        )
+        meta['width'], meta['height'] = display.size
+
+    return display_name, meta
+
+
+def resize_image(source_path, destination_path, width, height, quality=None, fmt='webp'):
+    """
+    Write a copy of the image at ``source_path`` fitted inside ``width`` x
+    ``height`` (0 leaves that side unbounded) to ``destination_path`` as
+    ``fmt``. Used for on-demand sizes (see imaging.resize).
+    """
+    box = (width or UNBOUNDED, height or UNBOUNDED)
+    with open_bounded(source_path, *box) as img:
+        img = _prepare(img)
+        img.thumbnail(box)
+        _encode(img, destination_path, fmt, quality)
+
+
+def image_files(name, meta):
+    """Every stored file belonging to an image: the field value, its original and all derivatives."""
+    names = {name, meta.get('original'), meta.get('display')}
+    names.update(variant['name'] for variant in meta.get('variants', {}).values())
+    for entry in meta.get('srcset', ()):
+        names.add(entry['name'])
+        names.update(variant['name'] for variant in entry.get('variants', {}).values())
+    names.discard(None)
+    return names
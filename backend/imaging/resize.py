@@ -0,0 +1,159 @@
+# imaging/resize.py
+"""
+On-demand resized copies of stored images, served by imaging.views.resized_image
+at /media-resize/<width>x<height>/<path>.
+
+Results live in a disk cache (IMAGE_RESIZE_CACHE_DIR) capped at
+IMAGE_RESIZE_CACHE_MAX_BYTES. A cache hit refreshes the file's mtime, and
+eviction removes the least recently used files first. A lock file per key
+makes concurrent requests for the same copy, from any thread or process,
+wait for one generation instead of each doing the work.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from .processing import FORMATS, resize_image
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT = 30 # Seconds before a lock file is assumed to belong to a dead process
+LOCK_POLL = 0.05
+
+
+class ResizeCache:
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size = None # Approximate bytes on disk, computed lazily
+        self._size_lock = threading.Lock()
+
+    def key(self, source_path, width, height, quality, fmt):
+        """Cache key; includes the source's mtime so replaced files aren't served stale."""
+        mtime = os.stat(source_path).st_mtime_ns
+        raw = f"{source_path}|{mtime}|{width}x{height}|q{quality}|{fmt}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def path(self, key, ext):
+        return os.path.join(self.directory, key[:2], f"{key}.{ext}")
+
+    def get_or_create(self, key, generate, ext):
+        """
+        Path of the cached file for ``key``, calling ``generate(tmp_path)``
+        to build it on a miss. Only one caller generates a given key at a time.
+        """
+        path = self.path(key, ext)
+        lock_path = path + '.lock'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        while True:
+            if os.path.exists(path):
+                self._touch(path)
+                return path
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._lock_is_stale(lock_path):
+                    self._remove(lock_path)
+                time.sleep(LOCK_POLL)
+                continue
+
+            os.close(fd)
+            try:
+                if not os.path.exists(path): # Finished by someone else meanwhile
+                    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    try:
+                        generate(tmp_path)
+                        os.replace(tmp_path, path)
+                    finally:
+                        self._remove(tmp_path)
+                    self._added(os.path.getsize(path))
+            finally:
+                self._remove(lock_path)
+            return path
+
+    def _lock_is_stale(self, lock_path):
+        try:
+            return time.time() - os.path.getmtime(lock_path) > LOCK_TIMEOUT
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass # Evicted in the meantime; the caller's open() will tell
+
+    def _added(self, size):
+        with self._size_lock:
+            if self._size is None:
+                self._size = self._disk_usage()
+            else:
+                self._size += size
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                if filename.endswith(('.lock', '.tmp')):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target_ratio=0.9):
+        """Delete least recently used files until the cache is under ``target_ratio`` of its cap."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * target_ratio
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        with self._size_lock:
+            self._size = total
+        if removed:
+            logger.info("Evicted %d resized image(s) from %s", removed, self.directory)
+
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = ResizeCache(settings.IMAGE_RESIZE_CACHE_DIR, settings.IMAGE_RESIZE_CACHE_MAX_BYTES)
+    return _cache
+
+
+def resized_copy(source_path, width, height, quality, fmt='webp'):
+    """Path of a cached ``fmt`` copy of ``source_path`` fitted inside ``width`` x ``height``."""
+    cache = get_cache()
+    key = cache.key(source_path, width, height, quality, fmt)
+    return cache.get_or_create(
+        key,
+        lambda tmp: resize_image(source_path, tmp, width, height, quality, fmt),
+        FORMATS[fmt][0],
+    )
@@ -0,0 +1,58 @@
+# imaging/serializers.py
+from rest_framework import serializers
+
+
+class ImageSrcsetField(serializers.Field):
+    """
+    Read-only list of the responsive copies of a ProcessedImageModel's image,
+    smallest first: [{"url": ..., "width": 320, "height": 480}, ...].
+    Empty until the image worker has processed the upload.
+
+    Declare it with ``source='*'`` so it gets the whole instance.
+    """
+    source_columns = ('image_meta',) # What it reads from the instance (see api.serializers)
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        storage = instance._meta.get_field('image').storage
+        request = self.context.get('request')
+        srcset = []
+        for entry in instance.image_meta.get('srcset', ()):
+            url = storage.url(entry['name'])
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            srcset.append({'url': url, 'width': entry['width'], 'height': entry['height']})
+        return srcset
+
+
+class ImageMetaField(serializers.Field):
+    """
+    Read-only value from a ProcessedImageModel's image_meta, or None until
+    the image is processed. Used for the display image's ``width`` and
+    ``height`` and its inline ``placeholder``, so pages can lay out and
+    paint a blurred preview before the real image arrives.
+    """
+    def __init__(self, key, **kwargs):
+        self.key = key
+        kwargs['source'] = 'image_meta'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, meta):
+        return meta.get(self.key)
+
+
+class ProcessedImageFieldsMixin(serializers.Serializer):
+    """
+    The processed-image fields for serializers of ProcessedImageModels:
+    ``image_srcset``, and the display image's ``image_width``,
+    ``image_height`` and ``image_placeholder``. List them in Meta.fields
+    where they should appear.
+    """
+    image_srcset = ImageSrcsetField(source='*')
+    image_width = ImageMetaField('width')
+    image_height = ImageMetaField('height')
+    image_placeholder = ImageMetaField('placeholder')
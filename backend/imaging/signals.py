@@ -0,0 +1,21 @@
+# imaging/signals.py
+from django.apps import apps
+from django.db.models.signals import post_delete
+from django.dispatch import Signal
+
+# Sent by the image worker after it points a record at its processed image.
+# That write is a queryset update(), so post_save doesn't fire for it.
+# Arguments: sender (the model class), pk.
+image_processed = Signal()
+
+
+def release_deleted_image(sender, instance, **kwargs):
+    instance.release_image(instance.image.name, instance.image_meta)
+
+
+def connect_signals():
+    from .models import ProcessedImageModel
+
+    for model in apps.get_models():
+        if issubclass(model, ProcessedImageModel):
+            post_delete.connect(release_deleted_image, sender=model, dispatch_uid=f'imaging_release_{model._meta.label}')
@@ -0,0 +1,45 @@
+# imaging/storage.py
+import hashlib
+import os
+import re
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+
+CAS_DIR = 'cas'
+_CAS_NAME_RE = re.compile(r'^%s/[0-9a-f]{2}/([0-9a-f]{64})\.' % CAS_DIR)
+
+
+def content_hash(name):
+    """SHA-256 embedded in a content-addressed storage name, or None for other names."""
+    match = _CAS_NAME_RE.match(name or '')
+    return match.group(1) if match else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores uploads under the SHA-256 of their bytes, e.g.
+    'cas/3f/3f2a...e1.jpg', whatever upload_to or filename they came with.
+    Uploading the same photo to Events, HomePage and the gallery therefore
+    stores (and, via the image worker, encodes) it once. Derived files are
+    named after the original (see imaging.processing.derivative_name), so
+    they are shared too. Deleting is reference counted by
+    imaging.models.StoredImage; don't delete CAS files directly.
+    """
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        sha = digest.hexdigest()
+        ext = os.path.splitext(name)[1].lower()
+        cas_name = f"{CAS_DIR}/{sha[:2]}/{sha}{ext}"
+        if self.exists(cas_name):
+            return cas_name
+
+        # Write under a temporary name and rename into place, so a concurrent
+        # upload of the same bytes never sees a half-written file.
+        tmp_name = super()._save(f"{cas_name}.{uuid.uuid4().hex}.tmp", content)
+        os.replace(self.path(tmp_name), self.path(cas_name))
+        return cas_name
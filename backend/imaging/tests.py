@@ -0,0 +1,319 @@
+import datetime
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock, skipUnless
+
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from Gallery.models import PhotoGallery
+
+from .models import ImageJob, StoredImage
+from .negotiation import choose_variant, preferred_format
+from .processing import ImageRejected, can_encode, open_bounded, process_image
+from .resize import LOCK_TIMEOUT, ResizeCache, resized_copy
+from .worker import process_job
+
+
+def image_bytes(size=(64, 48), color='navy', fmt='png'):
+    buf = io.BytesIO()
+    Image.new('RGB', size, color).save(buf, fmt)
+    return buf.getvalue()
+
+
+class TempMediaMixin:
+    """Runs each test with an empty MEDIA_ROOT of its own."""
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+@override_settings(IMAGE_JOB_MAX_ATTEMPTS=3, IMAGE_JOB_RETRY_DELAY=30)
+class ImageJobTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.photo = PhotoGallery.objects.create(name='photo') # Default image: nothing queued
+
+    def enqueue(self, **fields):
+        job = ImageJob.objects.enqueue(self.photo)
+        ImageJob.objects.filter(pk=job.pk).update(**fields)
+        return job
+
+    def test_claim_next(self):
+        now = timezone.now()
+        later = self.enqueue(available_at=now + datetime.timedelta(minutes=5))
+        second = self.enqueue(available_at=now - datetime.timedelta(minutes=1))
+        first = self.enqueue(available_at=now - datetime.timedelta(minutes=2))
+        self.enqueue(status=ImageJob.RUNNING, available_at=now - datetime.timedelta(minutes=3))
+
+        claimed = [ImageJob.objects.claim_next() for _ in range(3)]
+        self.assertEqual([job and job.pk for job in claimed], [first.pk, second.pk, None]) # Oldest runnable first
+        self.assertEqual((claimed[0].status, claimed[0].attempts), (ImageJob.RUNNING, 1))
+        self.assertEqual(ImageJob.objects.get(pk=later.pk).status, ImageJob.PENDING)
+
+    def test_mark_failed_backs_off_then_fails(self):
+        self.enqueue()
+        delays = []
+        for _ in range(3):
+            job = ImageJob.objects.claim_next()
+            before = timezone.now()
+            job.mark_failed(ValueError('broken'))
+            if job.status == ImageJob.PENDING:
+                delays.append(round((job.available_at - before).total_seconds()))
+                ImageJob.objects.filter(pk=job.pk).update(available_at=timezone.now()) # Skip the wait
+        self.assertEqual(delays, [30, 60])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.last_error), (ImageJob.FAILED, 3, 'broken'))
+
+    def test_mark_failed_without_retry(self):
+        self.enqueue()
+        job = ImageJob.objects.claim_next()
+        job.mark_failed(ValueError('not an image'), retry=False)
+        self.assertEqual(job.status, ImageJob.FAILED)
+        self.assertIsNone(ImageJob.objects.claim_next())
+
+
+class StoredImageTests(TempMediaMixin, TestCase):
+    def upload(self, name, **kwargs):
+        return SimpleUploadedFile(name, image_bytes(**kwargs))
+
+    def test_shared_upload_refcounting(self):
+        first = PhotoGallery.objects.create(name='first', image=self.upload('a.png'))
+        second = PhotoGallery.objects.create(name='second', image=self.upload('b.png'))
+        shared = first.image.name
+        self.assertEqual(second.image.name, shared) # Same bytes, one stored file
+        blob = StoredImage.objects.get(name=shared)
+        self.assertEqual(blob.refcount, 2)
+
+        # A derivative the worker wrote for the shared original
+        derivative = default_storage.save('cas/derived.webp', io.BytesIO(b'webp'))
+        StoredImage.objects.filter(pk=blob.pk).update(meta={'display': derivative})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.image = self.upload('c.png', color='red')
+            first.save()
+        self.assertEqual(StoredImage.objects.get(name=shared).refcount, 1)
+        self.assertEqual(StoredImage.objects.get(name=first.image.name).refcount, 1)
+        self.assertTrue(default_storage.exists(shared)) # Still used by the second record
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(StoredImage.objects.filter(name=shared).exists())
+        self.assertFalse(default_storage.exists(shared))
+        self.assertFalse(default_storage.exists(derivative))
+        self.assertTrue(default_storage.exists(first.image.name))
+
+
+class OpenBoundedTests(TempMediaMixin, TestCase):
+    def write(self, name, size, fmt):
+        path = f"{self.media_root}/{name}"
+        with open(path, 'wb') as f:
+            f.write(image_bytes(size, fmt=fmt))
+        return path
+
+    @override_settings(IMAGE_MAX_SOURCE_PIXELS=100_000)
+    def test_rejects_oversized_source(self):
+        path = self.write('big.png', (400, 300), 'png')
+        with self.assertRaisesMessage(ImageRejected, '400x300 exceeds the 100000 pixel limit'):
+            open_bounded(path, 100)
+
+    @override_settings(IMAGE_MAX_SOURCE_PIXELS=100_000)
+    def test_worker_fails_oversized_upload_without_retry(self):
+        PhotoGallery.objects.create(name='big', image=SimpleUploadedFile('big.png', image_bytes((400, 300))))
+        job = ImageJob.objects.claim_next()
+        process_job(job)
+        self.assertEqual((job.status, job.attempts), (ImageJob.FAILED, 1))
+
+    def test_decodes_jpeg_at_reduced_scale(self):
+        path = self.write('photo.jpg', (2000, 1500), 'jpeg')
+        with open_bounded(path, 300) as img:
+            self.assertEqual(img.size, (500, 375)) # 1/4 scale: the smallest still >= 300 wide
+
+    @override_settings(IMAGE_DECODE_PIXEL_BUDGET=100_000)
+    def test_decode_budget(self):
+        path = self.write('wide.png', (400, 400), 'png') # PNGs can't be decoded at reduced scale
+        with self.assertRaisesMessage(ImageRejected, 'exceeds the 100000 pixel budget'):
+            open_bounded(path, 100)
+
+
+@override_settings(IMAGE_DERIVATIVE_WIDTHS=[320, 640, 1280], IMAGE_EXTRA_FORMATS=['jpeg'])
+class ProcessImageTests(TempMediaMixin, TestCase):
+    def test_derivatives_and_meta(self):
+        source = default_storage.save('images/wide.png', io.BytesIO(image_bytes((1000, 500))))
+        display, meta = process_image(default_storage, source)
+
+        base = os.path.splitext(source)[0]
+        self.assertEqual(display, f'{base}.720x1080.webp')
+        self.assertEqual((meta['width'], meta['height']), (720, 360)) # Fitted inside 720x1080
+        # Smallest first; 1280 is capped at the source width rather than upscaled
+        self.assertEqual([(e['width'], e['height']) for e in meta['srcset']], [(320, 160), (640, 320), (1000, 500)])
+        self.assertEqual(meta['srcset'][0]['name'], f'{base}.320w.webp')
+        self.assertEqual(set(meta['variants']), {'jpeg'})
+        with Image.open(default_storage.path(meta['srcset'][-1]['name'])) as img:
+            self.assertEqual(img.size, (1000, 500))
+        self.assertTrue(meta['placeholder'].startswith('data:image/webp;base64,'))
+        self.assertLess(len(meta['placeholder']), 1000)
+
+    def test_serialized_fields(self):
+        photo = PhotoGallery.objects.create(name='wide', image=SimpleUploadedFile('wide.png', image_bytes((1000, 500))))
+        fields = 'fields=id,image_srcset,image_width,image_height,image_placeholder'
+        self.assertEqual(
+            self.client.get(f'/api/gallery/photos/?{fields}').json(),
+            [{'id': photo.pk, 'image_srcset': [], 'image_width': None, 'image_height': None, 'image_placeholder': None}],
+        )
+
+        process_job(ImageJob.objects.claim_next())
+        photo.refresh_from_db()
+        item, = self.client.get(f'/api/gallery/photos/?{fields}').json()
+        self.assertEqual((item['image_width'], item['image_height']), (720, 360))
+        self.assertEqual(item['image_placeholder'], photo.image_meta['placeholder'])
+        self.assertEqual([(e['width'], e['height']) for e in item['image_srcset']], [(320, 160), (640, 320), (1000, 500)])
+        self.assertEqual(item['image_srcset'][0]['url'], 'http://testserver' + default_storage.url(photo.image_meta['srcset'][0]['name']))
+
+
+class GcMediaTests(TempMediaMixin, TestCase):
+    def test_dry_run_then_delete(self):
+        photo = PhotoGallery.objects.create(name='kept', image=SimpleUploadedFile('kept.png', image_bytes()))
+        orphan = os.path.join(self.media_root, 'images', 'old', 'orphan.jpg')
+        os.makedirs(os.path.dirname(orphan))
+        with open(orphan, 'wb') as f:
+            f.write(b'x' * 10)
+
+        out = io.StringIO()
+        call_command('gc_media', '--dry-run', min_age=0, verbosity=2, stdout=out)
+        self.assertIn('unreferenced            10  images/old/orphan.jpg', out.getvalue())
+        self.assertIn('Found 1 unreferenced file(s)', out.getvalue())
+        self.assertTrue(os.path.exists(orphan))
+
+        call_command('gc_media', min_age=0, delete=True, stdout=io.StringIO())
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, 'images'))) # Emptied directories go too
+        self.assertTrue(default_storage.exists(photo.image.name))
+
+
+class ResizeCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.cache = ResizeCache(directory, max_bytes=250)
+        self.generated = []
+
+    def generate(self, size=100, delay=0):
+        def write(path):
+            self.generated.append(path)
+            time.sleep(delay)
+            with open(path, 'wb') as f:
+                f.write(b'x' * size)
+        return write
+
+    def test_concurrent_requests_generate_once(self):
+        paths = []
+
+        def request():
+            paths.append(self.cache.get_or_create('k' * 64, self.generate(delay=0.2), 'webp'))
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.generated), 1)
+        self.assertEqual(len(set(paths)), 1)
+        self.assertFalse(os.path.exists(paths[0] + '.lock'))
+
+    def test_stale_lock_is_taken_over(self):
+        path = self.cache.path('s' * 64, 'webp')
+        os.makedirs(os.path.dirname(path))
+        with open(path + '.lock', 'w'):
+            pass
+        stale = time.time() - LOCK_TIMEOUT - 1
+        os.utime(path + '.lock', (stale, stale)) # Left behind by a dead process
+        self.assertEqual(self.cache.get_or_create('s' * 64, self.generate(), 'webp'), path)
+        self.assertTrue(os.path.exists(path))
+
+    def test_evicts_least_recently_used(self):
+        a = self.cache.get_or_create('a' * 64, self.generate(), 'webp')
+        b = self.cache.get_or_create('b' * 64, self.generate(), 'webp')
+        os.utime(a, (1000, 1000))
+        os.utime(b, (2000, 2000))
+        self.cache.get_or_create('a' * 64, self.generate(), 'webp') # A hit makes a the most recent
+        c = self.cache.get_or_create('c' * 64, self.generate(), 'webp') # 300 bytes > 250: evict to 225
+        self.assertEqual([os.path.exists(path) for path in (a, b, c)], [True, False, True])
+
+
+class ResizedImageViewTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('imaging.resize._cache', ResizeCache(os.path.join(self.media_root, 'resized'), 10 ** 6))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.source = default_storage.save('images/photo.png', io.BytesIO(image_bytes((400, 300))))
+        self.evictions = 0
+
+    def evicting(self, times):
+        """resized_copy(), with the result evicted before the view opens it the first ``times`` calls."""
+        def copy(*args):
+            path = resized_copy(*args)
+            if self.evictions < times:
+                self.evictions += 1
+                os.remove(path)
+            return path
+        return mock.patch('imaging.views.resized_copy', copy)
+
+    def test_regenerates_evicted_copy(self):
+        with self.evicting(1):
+            response = self.client.get(f'/media-resize/160x0/{self.source}', headers={'Accept': 'image/webp'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        with Image.open(io.BytesIO(b''.join(response.streaming_content))) as img:
+            self.assertEqual(img.size, (160, 120))
+
+    def test_evicted_twice_is_not_found(self):
+        with self.evicting(2):
+            response = self.client.get(f'/media-resize/160x0/{self.source}')
+        self.assertEqual(response.status_code, 404)
+
+
+class NegotiationTests(SimpleTestCase):
+    CHROME = 'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8'
+
+    @skipUnless(can_encode('avif'), "Pillow without an AVIF encoder")
+    @override_settings(IMAGE_EXTRA_FORMATS=['avif', 'jpeg'])
+    def test_preferred_format_avif(self):
+        self.assertEqual(preferred_format(self.CHROME), 'avif')
+
+    @override_settings(IMAGE_EXTRA_FORMATS=['jpeg'])
+    def test_preferred_format(self):
+        self.assertEqual(preferred_format(self.CHROME), 'webp') # AVIF not generated
+        self.assertEqual(preferred_format('image/webp;q=0, image/*'), 'jpeg')
+        self.assertEqual(preferred_format('*/*'), 'jpeg') # Wildcards don't vouch for WebP
+        self.assertEqual(preferred_format(''), 'jpeg')
+
+    @override_settings(IMAGE_EXTRA_FORMATS=['avif', 'jpeg'])
+    def test_preferred_format_without_avif_encoder(self):
+        with mock.patch('imaging.processing.can_encode', lambda fmt: fmt != 'avif'):
+            self.assertEqual(preferred_format(self.CHROME), 'webp')
+
+    def test_choose_variant(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        storage = FileSystemStorage(location=directory)
+        for ext, size in (('webp', 300), ('avif', 100), ('jpg', 200)):
+            with open(os.path.join(directory, f'photo.720w.{ext}'), 'wb') as f:
+                f.write(b'x' * size)
+
+        self.assertEqual(choose_variant(storage, 'photo.720w.webp', self.CHROME), ('photo.720w.avif', 'image/avif'))
+        # JPEG is always acceptable, so it wins when it is smaller than the WebP
+        self.assertEqual(choose_variant(storage, 'photo.720w.webp', 'image/webp'), ('photo.720w.jpg', 'image/jpeg'))
+        self.assertEqual(choose_variant(storage, 'missing.webp', self.CHROME), ('missing.webp', 'image/webp'))
@@ -0,0 +1,72 @@
+# imaging/views.py
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponseBadRequest
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET
+from django.views.static import serve
+
+from .negotiation import choose_variant, preferred_format
+from .processing import FORMATS, UNPROCESSABLE_ERRORS
+from .resize import resized_copy
+
+
+@require_GET
+def resized_image(request, width, height, path):
+    """
+    /media-resize/<width>x<height>/<path>?q=<quality>
+    A copy of the stored image at ``path`` fitted inside width x height
+    (0 = unbounded), as AVIF, WebP or JPEG depending on the Accept header.
+    Sizes and qualities are limited to the allowlists in settings so the
+    endpoint can't be used to fill the disk or burn CPU.
+    """
+    quality = request.GET.get('q')
+    if quality is not None:
+        try:
+            quality = int(quality)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid quality")
+        if quality not in settings.IMAGE_RESIZE_QUALITIES:
+            return HttpResponseBadRequest(f"Quality must be one of {sorted(settings.IMAGE_RESIZE_QUALITIES)}")
+    allowed = settings.IMAGE_RESIZE_DIMENSIONS
+    if width not in allowed or height not in allowed or not (width or height):
+        return HttpResponseBadRequest(f"Size must be <width>x<height> with each of {sorted(allowed)}, not both 0")
+
+    try:
+        source_path = default_storage.path(path)
+    except SuspiciousFileOperation:
+        raise Http404("Image not found")
+    fmt = preferred_format(request.headers.get('Accept', ''))
+    try:
+        try:
+            file = open(resized_copy(source_path, width, height, quality, fmt), 'rb')
+        except FileNotFoundError: # Evicted from the cache (see imaging.resize) before we opened it; make it again
+            file = open(resized_copy(source_path, width, height, quality, fmt), 'rb')
+    except UNPROCESSABLE_ERRORS:
+        raise Http404("Not a supported image")
+    except OSError: # Missing, a directory, unreadable...
+        raise Http404("Image not found")
+
+    response = FileResponse(file, content_type=FORMATS[fmt][1])
+    response['Cache-Control'] = f"public, max-age={settings.IMAGE_RESIZE_MAX_AGE}"
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+@require_GET
+def media(request, path):
+    """
+    Serves MEDIA_ROOT (when SERVE_MEDIA is on). Requests for a WebP
+    derivative get the smallest of its AVIF/WebP/JPEG variants that the
+    client accepts, so API URLs can stay the same for every browser.
+    """
+    if not path.lower().endswith('.webp'):
+        return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    name, content_type = choose_variant(default_storage, path, request.headers.get('Accept', ''))
+    response = serve(request, name, document_root=settings.MEDIA_ROOT)
+    if response.status_code == 200:
+        response['Content-Type'] = content_type
+    patch_vary_headers(response, ['Accept'])
+    return response
@@ -0,0 +1,97 @@
+# imaging/worker.py
+"""
+Runs queued ImageJobs. Started with ``python manage.py run_image_worker``.
+"""
+import logging
+import time
+
+import django
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from .models import ImageJob, StoredImage
+from .processing import UNPROCESSABLE_ERRORS, image_files, process_image
+from .signals import image_processed
+from .storage import content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def init_pool_process():
+    """
+    Initializer for process pools that run pipeline code. Needed where
+    processes are spawned (Windows, macOS); harmless after a fork, apart
+    from dropping the parent's database connections, which mustn't be shared.
+    """
+    django.setup()
+    connections.close_all()
+
+
+def process_job(job):
+    """
+    Convert the image ``job`` was queued for and point the record at the result.
+    The record is only updated if it still holds the same image, so a job for
+    an image that was replaced in the meantime can't clobber the newer upload.
+    """
+    model = job.content_type.model_class()
+    manager = model._default_manager
+    if not manager.filter(pk=job.object_id, image=job.source_name).exists():
+        job.mark_done(ImageJob.CANCELLED)
+        return
+
+    storage = model._meta.get_field('image').storage
+    blob = StoredImage.objects.filter(name=job.source_name).first()
+    if blob is not None and blob.meta and storage.exists(blob.meta['display']):
+        # Same bytes were uploaded (and encoded) before
+        _apply(job, manager, storage, blob.meta['display'], blob.meta)
+        return
+
+    try:
+        display_name, meta = process_image(storage, job.source_name)
+    except (FileNotFoundError, *UNPROCESSABLE_ERRORS) as e:
+        # Retrying won't help with a missing, non-image or oversized file
+        job.mark_failed(e, retry=False)
+        return
+    except Exception as e:
+        logger.exception("Error processing %s", job)
+        job.mark_failed(e)
+        return
+
+    meta['display'] = display_name
+    if blob is not None:
+        StoredImage.objects.filter(pk=blob.pk).update(meta=meta)
+    _apply(job, manager, storage, display_name, meta)
+
+
+def _apply(job, manager, storage, display_name, meta):
+    updated = manager.filter(pk=job.object_id, image=job.source_name).update(image=display_name, image_meta=meta)
+    if updated:
+        job.mark_done()
+        image_processed.send(sender=manager.model, pk=job.object_id)
+        return
+    # Replaced while we were working; shared files are cleaned up by StoredImage.
+    if content_hash(job.source_name) is None:
+        for name in image_files(display_name, meta) - {job.source_name}:
+            storage.delete(name)
+    job.mark_done(ImageJob.CANCELLED)
+
+
+def run_worker(once=False, poll_interval=None, stdout=None):
+    """Process jobs until interrupted, or until the queue is empty if ``once``."""
+    poll_interval = poll_interval or settings.IMAGE_WORKER_POLL_INTERVAL
+    processed = 0
+    while True:
+        close_old_connections()
+        ImageJob.objects.requeue_stale(settings.IMAGE_JOB_STALE_AFTER)
+        job = ImageJob.objects.claim_next()
+        if job is None:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+            continue
+
+        started = time.monotonic()
+        process_job(job)
+        processed += 1
+        if stdout is not None:
+            stdout.write(f"{job} in {time.monotonic() - started:.2f}s")
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class NotificationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'notification'
+
+    def ready(self):
+        from django.db.models.signals import post_delete
+
+        from api.versions import track
+        from search.index import register
+
+        from .models import Notification
+        from .sync import record_deletion
+
+        post_delete.connect(record_deletion, sender=Notification, dispatch_uid='notification_tombstone')
+        track(Notification)
+        register(Notification, 'notification', title='title', body=['message'], include=lambda n: n.is_active)
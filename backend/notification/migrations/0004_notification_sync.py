@@ -0,0 +1,38 @@
+# Generated by Django 5.1 on 2026-10-17 11:51
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_timestamp(apps, schema_editor):
+    # Existing notifications were last changed no later than now; their creation time is the best guess
+    Notification = apps.get_model('notification', 'Notification')
+    Notification.objects.update(updated_at=models.F('timestamp'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0003_notification_notification_timestamp_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(copy_timestamp, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['updated_at'], name='notification_updated_idx'),
+        ),
+    ]
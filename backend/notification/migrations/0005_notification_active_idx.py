@@ -0,0 +1,22 @@
+# Generated by Django 5.1 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0004_notification_sync'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationtombstone',
+            name='notification_id',
+            field=models.BigIntegerField(db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['timestamp'], name='notification_active_idx'),
+        ),
+    ]
@@ -8,13 +8,29 @@ class Notification(models.Model):
     link = models.URLField(max_length=200, blank=True, null=True) # Optional link
     is_active = models.BooleanField(default=True) # To control visibility/pop-up behavior
     timestamp = models.DateTimeField(auto_now_add=True) # Automatically set on creation
+    updated_at = models.DateTimeField(auto_now=True) # Set on every save; read by ?since= sync (queryset.update() skips it)
     # If you want to be able to update the timestamp or set it manually sometimes:
     # created_at = models.DateTimeField(auto_now_add=True)
-    # updated_at = models.DateTimeField(auto_now=True)
     # effective_date = models.DateTimeField(default=timezone.now) # Example of a specific date
 
     def __str__(self):
         return self.title
 
     class Meta:
-        ordering = ['-timestamp'] # Show newest notifications first by default
\ No newline at end of file
+        ordering = ['-timestamp'] # Show newest notifications first by default
+        indexes = [
+            models.Index(fields=['timestamp'], name='notification_timestamp_idx'), # Ordering and cursor pagination
+            models.Index(fields=['updated_at'], name='notification_updated_idx'), # ?since= sync
+            # Active list, newest first. Partial rather than (is_active, timestamp): Django filters
+            # booleans as a bare "WHERE is_active", which can't use an index led by is_active on SQLite
+            models.Index(fields=['timestamp'], condition=models.Q(is_active=True), name='notification_active_idx'),
+        ]
+
+
+class NotificationTombstone(models.Model):
+    """A deleted notification, so ?since= sync can tell clients to drop it."""
+    notification_id = models.BigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"Notification {self.notification_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
@@ -1,8 +1,9 @@
 # notification/serializers.py
 from rest_framework import serializers
+from api.serializers import SparseFieldsMixin
 from .models import Notification
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ['id', 'title', 'message', 'link', 'is_active', 'timestamp']
@@ -1,18 +1,28 @@
 # notification/views.py
 from rest_framework import generics
+from api.fastpath import FastListMixin
+from api.mixins import ConditionalListMixin, SparseQuerysetMixin
+from api.pagination import OptInCursorPagination
 from .models import Notification
 from .serializers import NotificationSerializer
+from .sync import SinceSyncMixin
 
-class NotificationListAPIView(generics.ListAPIView):
+class NotificationListAPIView(ConditionalListMixin, SparseQuerysetMixin, SinceSyncMixin, FastListMixin, generics.ListAPIView):
     """
     API endpoint that allows all notifications to be viewed.
+    ?since= returns only what changed (see notification.sync).
     """
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
+    pagination_class = OptInCursorPagination
+    cursor_ordering = '-timestamp'
 
-class ActiveNotificationListAPIView(generics.ListAPIView):
+class ActiveNotificationListAPIView(ConditionalListMixin, SparseQuerysetMixin, SinceSyncMixin, FastListMixin, generics.ListAPIView):
     """
     API endpoint that allows only active notifications to be viewed.
+    ?since= returns only what changed; deactivated ones are listed as deleted.
     """
     queryset = Notification.objects.filter(is_active=True)
-    serializer_class = NotificationSerializer
\ No newline at end of file
+    serializer_class = NotificationSerializer
+    pagination_class = OptInCursorPagination
+    cursor_ordering = '-timestamp'
\ No newline at end of file
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from .index import build_if_empty
+
+        post_migrate.connect(build_if_empty, sender=self, dispatch_uid='search_build_if_empty')
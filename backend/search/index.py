@@ -0,0 +1,189 @@
+# search/index.py
+"""
+Full-text search over the site's content, in a SQLite FTS5 table.
+
+Apps register the models to index in AppConfig.ready():
+
+    register(Astrax, 'astrax', title='name', body=['description'])
+
+Each registered object is a row in FTS_TABLE (its title and its body with
+HTML stripped) and a SearchDocument, whose id is the row's rowid; deleting
+the SearchDocument deletes the row (a trigger, see migration 0002). Saves
+and deletes update the index in the same transaction. Writes that skip
+signals (bulk_create, queryset update()) must call ``index_objects()`` or
+``remove_objects()`` themselves. ``python manage.py rebuild_search_index``
+rebuilds everything; an empty index is built after ``migrate``.
+
+FTS5 is SQLite's; on other databases nothing is indexed and ``search()``
+raises SearchUnavailable.
+"""
+import html
+import re
+
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.html import escape, strip_tags
+
+from .models import SearchDocument
+
+FTS_TABLE = 'search_index'
+
+TITLE_WEIGHT = 10.0 # A match in the title ranks as ten in the body
+SNIPPET_TOKENS = 16
+
+# Marks around matches while the text is still unescaped; they become <mark> after escaping
+_OPEN, _CLOSE = '\x02', '\x03'
+
+_sources = {}
+
+
+class SearchUnavailable(Exception):
+    pass
+
+
+def available():
+    return connection.vendor == 'sqlite'
+
+
+def plain_text(value):
+    """Rich text (CKEditor HTML) as plain text, with the words of adjacent tags kept apart."""
+    if not value:
+        return ''
+    text = html.unescape(strip_tags(str(value).replace('<', ' <')))
+    return ' '.join(text.split())
+
+
+def register(model, kind, title, body=(), include=None):
+    """
+    Index ``model`` under ``kind``: its ``title`` field and ``body`` fields
+    are indexed, for the objects ``include(obj)`` accepts (default: all).
+    """
+    _sources[kind] = {'model': model, 'title': title, 'body': tuple(body), 'include': include}
+    uid = f'search_{kind}'
+    post_save.connect(_index_sender, sender=model, dispatch_uid=uid)
+    post_delete.connect(_remove_sender, sender=model, dispatch_uid=uid)
+
+
+def registered_models():
+    return [source['model'] for source in _sources.values()]
+
+
+def _kind_of(model):
+    for kind, source in _sources.items():
+        if source['model'] is model:
+            return kind
+    return None
+
+
+def _document(kind, obj):
+    """``(title, body)`` to index for ``obj``, or None if it shouldn't be searchable."""
+    source = _sources[kind]
+    if source['include'] is not None and not source['include'](obj):
+        return None
+    title = plain_text(getattr(obj, source['title']))
+    body = ' '.join(filter(None, (plain_text(getattr(obj, name)) for name in source['body'])))
+    return title, body
+
+
+def _delete_rows(kind, object_ids):
+    SearchDocument.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def index_objects(objs):
+    """Add or refresh ``objs`` (instances of one registered model) in the index."""
+    objs = [obj for obj in objs if obj.pk is not None]
+    kind = _kind_of(type(objs[0])) if objs else None
+    if kind is None or not available():
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        _delete_rows(kind, [obj.pk for obj in objs])
+        for obj in objs:
+            document = _document(kind, obj)
+            if document is None:
+                continue
+            entry = SearchDocument.objects.create(kind=kind, object_id=obj.pk)
+            cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (%s, %s, %s)', [entry.pk, *document])
+
+
+def remove_objects(model, object_ids):
+    """Drop the objects of ``model`` with ``object_ids`` from the index."""
+    kind = _kind_of(model)
+    if kind is None or not available():
+        return
+    with transaction.atomic():
+        _delete_rows(kind, list(object_ids))
+
+
+def _index_sender(sender, instance, **kwargs):
+    index_objects([instance])
+
+
+def _remove_sender(sender, instance, **kwargs):
+    remove_objects(sender, [instance.pk])
+
+
+def rebuild():
+    """Index every registered object from scratch. Returns ``{kind: objects indexed}``."""
+    if not available():
+        raise SearchUnavailable("Full-text search needs SQLite with FTS5")
+    counts = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        SearchDocument.objects.all().delete()
+        for kind, source in _sources.items():
+            objs = list(source['model']._default_manager.all())
+            index_objects(objs)
+            counts[kind] = SearchDocument.objects.filter(kind=kind).count()
+    return counts
+
+
+def build_if_empty(**kwargs):
+    """post_migrate receiver: build the index the first time, e.g. right after the migration creating it."""
+    if available() and not SearchDocument.objects.exists():
+        if any(source['model']._default_manager.exists() for source in _sources.values()):
+            rebuild()
+
+
+def _match_expression(query):
+    """The FTS5 query for user input: every word, as a prefix, in any order."""
+    words = re.findall(r'\w+', query)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def _highlighted(text):
+    return escape(text).replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+
+
+def search(query, kinds=None, limit=20):
+    """
+    Best matches for ``query`` as dicts with the object's ``type`` (its
+    kind) and ``id``, the ``title`` and a ``snippet`` of the body as HTML
+    with the matches in <mark>, and the bm25 ``score`` (lower is better).
+    """
+    if not available():
+        raise SearchUnavailable("Full-text search needs SQLite with FTS5")
+    match = _match_expression(query)
+    if not match:
+        return []
+    kinds = [kind for kind in (kinds or _sources) if kind in _sources]
+    if not kinds:
+        return []
+
+    sql = f"""
+        SELECT d.kind, d.object_id,
+               highlight({FTS_TABLE}, 0, %s, %s),
+               snippet({FTS_TABLE}, 1, %s, %s, '…', {SNIPPET_TOKENS}),
+               bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0) AS score
+        FROM {FTS_TABLE}
+        JOIN {SearchDocument._meta.db_table} d ON d.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH %s AND d.kind IN ({', '.join(['%s'] * len(kinds))})
+        ORDER BY score
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [_OPEN, _CLOSE, _OPEN, _CLOSE, match, *kinds, limit])
+        rows = cursor.fetchall()
+    return [
+        {'type': kind, 'id': object_id, 'title': _highlighted(title), 'snippet': _highlighted(snippet), 'score': score}
+        for kind, object_id, title, snippet, score in rows
+    ]
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.index import SearchUnavailable, rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the full-text search index (see search.index) from every "
+        "registered model, e.g. after data was changed without signals."
+    )
+
+    def handle(self, *args, **options):
+        try:
+            counts = rebuild()
+        except SearchUnavailable as e:
+            raise CommandError(str(e))
+        for kind, count in counts.items():
+            self.stdout.write(f"  {kind:<14} {count}")
+        self.stdout.write(self.style.SUCCESS(f"Indexed {sum(counts.values())} object(s)."))
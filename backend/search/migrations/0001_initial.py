@@ -0,0 +1,37 @@
+# Generated by Django 5.1 on 2026-10-17 12:07
+
+from django.db import migrations, models
+
+
+def create_fts_table(apps, schema_editor):
+    # FTS5 is SQLite's; elsewhere search is unavailable (search.index.available)
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(title, body, tokenize="unicode61 remove_diacritics 2")')
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS search_index')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30)),
+                ('object_id', models.BigIntegerField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_document_unique')],
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1 on 2026-10-17 18:40
+
+from django.db import migrations
+
+
+def create_delete_trigger(apps, schema_editor):
+    # Deleting a SearchDocument deletes its FTS row, whatever deletes it: the
+    # flush command (and so TransactionTestCase) empties the model tables only
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE TRIGGER IF NOT EXISTS search_document_delete AFTER DELETE ON search_searchdocument '
+            'BEGIN DELETE FROM search_index WHERE rowid = old.id; END'
+        )
+        schema_editor.execute('DELETE FROM search_index WHERE rowid NOT IN (SELECT id FROM search_searchdocument)')
+
+
+def drop_delete_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TRIGGER IF EXISTS search_document_delete')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_delete_trigger, drop_delete_trigger),
+    ]
@@ -0,0 +1,19 @@
+# search/models.py
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    One indexed object. Its id is the rowid of its row in the FTS5 table
+    (search.index.FTS_TABLE), which holds the text.
+    """
+    kind = models.CharField(max_length=30) # Name the model was registered under, e.g. 'astrax'
+    object_id = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
@@ -0,0 +1,42 @@
+# search/views.py
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.mixins import ConditionalListMixin
+
+from .index import SearchUnavailable, registered_models, search
+
+
+class SearchAPIView(APIView):
+    """
+    Site search: ``/api/search/?q=nebula`` returns the best matches across
+    events, gallery, alumni, the core team and notifications, as
+    ``{"query", "results": [{type, id, title, snippet, score}]}`` with the
+    matched words in <mark> (see search.index.search). ``?type=astrax,photo``
+    limits the kinds searched and ``?limit=`` the number of results.
+    """
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get('limit', settings.SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            limit = settings.SEARCH_DEFAULT_LIMIT
+        return max(1, min(limit, settings.SEARCH_MAX_LIMIT))
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Give the words to search for with ?q="}, status=status.HTTP_400_BAD_REQUEST)
+        kinds = [kind.strip() for kind in request.query_params.get('type', '').split(',') if kind.strip()]
+        try:
+            results = search(query, kinds=kinds or None, limit=self.get_limit())
+        except SearchUnavailable as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response({"query": query, "results": results}, status=status.HTTP_200_OK)
+
+
+class SearchView(ConditionalListMixin, SearchAPIView):
+    """The search endpoint, answering conditional GETs until any indexed model changes."""
+    def get_version_models(self):
+        return registered_models()
@@ -14,13 +14,20 @@ export interface TeamMemberItem {
   image: string;
 }
 
-async function getTeamData(): Promise<TeamMemberItem[] | null> {
+export interface TeamGroup {
+  position: string;
+  position_display: string;
+  members: TeamMemberItem[];
+}
+
+async function getTeamData(): Promise<TeamGroup[] | null> {
   try {
     const baseUrl = process.env.NEXT_PUBLIC_API_URL || 'http://127.0.0.1:8000';
     // IMPORTANT: Make sure your image URLs from the API are absolute URLs
     // e.g., 'http://127.0.0.1:8000/media/images/santu.jpg'
     // not '/media/images/santu.jpg'
-    const apiUrl = `${baseUrl}/api/coreteam/`;
+    // ?grouped=1 returns the members already grouped by position
+    const apiUrl = `${baseUrl}/api/coreteam/?grouped=1`;
     const response = await fetch(apiUrl, { next: { revalidate: 3600 } });
 
     if (!response.ok) {
@@ -29,10 +36,13 @@ async function getTeamData(): Promise<TeamMemberItem[] | null> {
     }
     
     // Modify image URLs to be absolute if they are relative
-    const data: TeamMemberItem[] = await response.json();
-    return data.map(member => ({
-      ...member,
-      image: member.image.startsWith('http') ? member.image : `${baseUrl}${member.image}`
+    const data: TeamGroup[] = await response.json();
+    return data.map(group => ({
+      ...group,
+      members: group.members.map(member => ({
+        ...member,
+        image: member.image.startsWith('http') ? member.image : `${baseUrl}${member.image}`
+      })),
     }));
 
   } catch (error) {
@@ -63,7 +73,7 @@ export default async function TeamPage() {
       </main>
     );
   }
-  if (teamData.length === 0) {
+  if (teamData.every(group => group.members.length === 0)) {
     return (
       <main className="w-full bg-transparent">
         <div className="container mx-auto flex min-h-[calc(100vh-130px)] flex-col items-center justify-center p-4 text-center">
@@ -75,19 +85,14 @@ export default async function TeamPage() {
     );
   }
 
-  // --- Grouping and Sorting Logic (Unchanged) ---
-  const groupedMembers = teamData.reduce((acc, member) => {
-    const key = member.position_display || 'Other';
-    if (!acc[key]) acc[key] = [];
-    acc[key].push(member);
-    return acc;
-  }, {} as { [key: string]: TeamMemberItem[] });
-
-  const sortedGroupKeys = Object.keys(groupedMembers).sort((a, b) => {
-    const posA = teamData.find(m => m.position_display === a)?.position || '';
-    const posB = teamData.find(m => m.position_display === b)?.position || '';
-    return (positionOrder[posA] || 99) - (positionOrder[posB] || 99);
-  });
+  // --- Sorting Logic (the API does the grouping) ---
+  const groups = teamData
+    .filter(group => group.members.length > 0)
+    .sort((a, b) => (positionOrder[a.position] || 99) - (positionOrder[b.position] || 99));
+  const groupedMembers = Object.fromEntries(
+    groups.map(group => [group.position_display || 'Other', group.members])
+  ) as { [key: string]: TeamMemberItem[] };
+  const sortedGroupKeys = Object.keys(groupedMembers);
 
   return (
     <main className="min-h-screen bg-gray-900 dark:bg-black">
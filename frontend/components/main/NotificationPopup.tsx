@@ -19,19 +19,50 @@ interface NotificationItem {
   timestamp: string;
 }
 
-// --- API Fetching (Unchanged) ---
+// --- API Fetching ---
+interface NotificationSync {
+  notifications: NotificationItem[];
+  deleted: number[];
+  cursor: string;
+  full: boolean;
+}
+
+const SYNC_STORAGE_KEY = 'activeNotificationsSync';
+
+function loadStoredSync(): { notifications: NotificationItem[]; cursor: string } | null {
+  try {
+    const stored = JSON.parse(localStorage.getItem(SYNC_STORAGE_KEY) || 'null');
+    return stored && Array.isArray(stored.notifications) && typeof stored.cursor === 'string' ? stored : null;
+  } catch {
+    return null;
+  }
+}
+
+// Keeps a copy of the list in localStorage and only asks the API for what changed since the last visit
 async function getActiveNotifications(): Promise<NotificationItem[] | null> {
   try {
     const baseUrl = process.env.NEXT_PUBLIC_API_URL || 'http://127.0.0.1:8000';
-    const apiUrl = `${baseUrl}/api/notifications/active/`;
-    const response = await fetch(apiUrl, { cache: 'no-store' });
+    const stored = loadStoredSync();
+    const apiUrl = `${baseUrl}/api/notifications/active/?since=${encodeURIComponent(stored ? stored.cursor : '0')}`;
+    // 'no-cache' revalidates with the stored ETag, so an unchanged list (e.g. the first load's ?since=0) costs a 304
+    const response = await fetch(apiUrl, { cache: 'no-cache' });
 
     if (!response.ok) {
       console.error("Pop-up: Failed to fetch active notifications:", response.status, response.statusText);
-      return null;
+      return stored ? stored.notifications : null;
     }
-    const data = await response.json();
-    return Array.isArray(data) ? (data as NotificationItem[]) : null;
+    const data = (await response.json()) as NotificationSync;
+    if (!Array.isArray(data.notifications) || !Array.isArray(data.deleted)) return null;
+
+    const byId = new Map<number, NotificationItem>();
+    if (stored && !data.full) stored.notifications.forEach(n => byId.set(n.id, n));
+    data.deleted.forEach(id => byId.delete(id));
+    data.notifications.forEach(n => byId.set(n.id, n));
+    const notifications = Array.from(byId.values())
+      .sort((a, b) => new Date(b.timestamp).getTime() - new Date(a.timestamp).getTime());
+
+    localStorage.setItem(SYNC_STORAGE_KEY, JSON.stringify({ notifications, cursor: data.cursor }));
+    return notifications;
   } catch (error) {
     console.error("Pop-up: Error fetching active notifications:", error);
     return null;